@@ -2,6 +2,7 @@ from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from ..db import get_db_session
 from ..models import User, ROLE_ADMIN
+from .user_cache import SessionUser, user_cache
 
 
 def get_db():
@@ -9,17 +10,22 @@ def get_db():
         yield db
 
 
-def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
+def get_current_user(request: Request, db: Session = Depends(get_db)) -> SessionUser:
     user_id = request.session.get("user_id")
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    cached = user_cache.get(user_id)
+    if cached:
+        return cached
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
-    return user
+    session_user = SessionUser(id=user.id, email=user.email, role=user.role)
+    user_cache.put(session_user)
+    return session_user
 
 
-def require_admin(user: User = Depends(get_current_user)) -> User:
+def require_admin(user: SessionUser = Depends(get_current_user)) -> SessionUser:
     if user.role != ROLE_ADMIN:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
     return user
@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from ..config import settings
+from ..metrics import REGISTRY
+
+USER_CACHE_REQUESTS = REGISTRY.counter(
+    "metasys_user_cache_requests_total", "Session user lookups by cache result.", ("result",)
+)
+
+
+@dataclass(frozen=True)
+class SessionUser:
+    id: int
+    email: str
+    role: str
+
+
+class UserCache:
+    """Bounded, TTL-limited map of user id to the fields needed to authorize a request.
+
+    Entries are per process; admin edits invalidate them here, other
+    processes see changes once the TTL expires.
+    """
+
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[SessionUser]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                USER_CACHE_REQUESTS.inc(result="hit")
+                return entry[1]
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            USER_CACHE_REQUESTS.inc(result="miss")
+            return None
+
+    def put(self, user: SessionUser):
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.user_cache_ttl, settings.user_cache_size)
@@ -0,0 +1,430 @@
+import argparse
+import csv
+import io
+import json
+import logging
+import sys
+from dataclasses import dataclass, field
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .db import get_db_session, init_db
+from .models import Group, Point
+
+logger = logging.getLogger(__name__)
+
+FIELDS = [
+    "group_number",
+    "group_name",
+    "group_description",
+    "building",
+    "floor",
+    "point_number",
+    "point_name",
+    "point_type",
+    "unit",
+    "read_only",
+    "allowed_operations",
+]
+FORMAT_CSV = "csv"
+FORMAT_JSON = "json"
+MAX_REPORTED_ERRORS = 100
+# Longest JSON record read before it is treated as malformed.
+MAX_RECORD_CHARS = 1_000_000
+
+_TRUE = {"1", "true", "yes", "on", "y"}
+_FALSE = {"", "0", "false", "no", "off", "n"}
+
+
+class RowError(ValueError):
+    """A record that could not be decoded; reported against its line like an invalid row."""
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    groups_created: int = 0
+    groups_updated: int = 0
+    points_created: int = 0
+    points_updated: int = 0
+    error_count: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+    fatal_error: Optional[str] = None
+    seen_groups: set = field(default_factory=set, repr=False)
+
+    def add_error(self, line: int, message: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "groups_created": self.groups_created,
+            "groups_updated": self.groups_updated,
+            "points_created": self.points_created,
+            "points_updated": self.points_updated,
+            "error_count": self.error_count,
+            "errors": [{"line": line, "message": message} for line, message in self.errors],
+            "fatal_error": self.fatal_error,
+        }
+
+
+@dataclass
+class ImportRow:
+    line: int
+    group_number: int
+    group_fields: dict
+    point_number: Optional[int] = None
+    point_fields: dict = field(default_factory=dict)
+
+
+def detect_format(filename: str, default: str = FORMAT_CSV) -> str:
+    lowered = (filename or "").lower()
+    if lowered.endswith((".json", ".ndjson", ".jsonl")):
+        return FORMAT_JSON
+    if lowered.endswith(".csv"):
+        return FORMAT_CSV
+    return default
+
+
+def iter_csv_rows(stream: IO[bytes]) -> Iterator[Tuple[int, dict]]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _iter_json_array(text: IO[str], buffer: str, chunk_size: int) -> Iterator[Tuple[int, object]]:
+    decoder = json.JSONDecoder()
+    pos = 0
+    index = 0
+    eof = False
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,[]":
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                return
+            buffer, pos = text.read(chunk_size), 0
+            eof = not buffer
+            continue
+        try:
+            obj, end = decoder.raw_decode(buffer, pos)
+        except ValueError:
+            # An object that still fails this far past its start is malformed, not truncated.
+            if eof or len(buffer) - pos > MAX_RECORD_CHARS:
+                raise ValueError(f"Invalid JSON near object {index + 1}")
+            chunk = text.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        index += 1
+        yield index, obj
+        pos = end
+
+
+def _iter_json_lines(text: IO[str], first: str, number: int) -> Iterator[Tuple[int, object]]:
+    while True:
+        line = first + text.readline(MAX_RECORD_CHARS)
+        first = ""
+        if not line:
+            return
+        number += 1
+        if len(line) >= MAX_RECORD_CHARS and not line.endswith("\n"):
+            rest = line
+            while rest and not rest.endswith("\n"):
+                rest = text.readline(MAX_RECORD_CHARS)
+            yield number, RowError(f"line is longer than {MAX_RECORD_CHARS} characters")
+            continue
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            row = RowError(f"invalid JSON: {exc}")
+        yield number, row
+
+
+def iter_json_rows(stream: IO[bytes], chunk_size: int = 65536) -> Iterator[Tuple[int, object]]:
+    """Yield objects from a JSON array or JSON Lines stream without loading it whole.
+
+    In JSON Lines mode an undecodable line is yielded as a `RowError` so the
+    import can report it and go on. A malformed array cannot be resynchronised
+    and raises ValueError.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig")
+    first = text.read(1)
+    skipped_lines = 0
+    while first.isspace():
+        skipped_lines += first == "\n"
+        first = text.read(1)
+    if first == "[":
+        yield from _iter_json_array(text, first, chunk_size)
+    else:
+        yield from _iter_json_lines(text, first, skipped_lines)
+
+
+def iter_rows(stream: IO[bytes], fmt: str) -> Iterator[Tuple[int, object]]:
+    if fmt == FORMAT_JSON:
+        return iter_json_rows(stream)
+    if fmt == FORMAT_CSV:
+        return iter_csv_rows(stream)
+    raise ValueError(f"Unsupported format: {fmt}")
+
+
+def _text(row: dict, key: str) -> Optional[str]:
+    value = row.get(key)
+    if value is None:
+        return None
+    return str(value).strip()
+
+
+def _int(row: dict, key: str, required: bool) -> Optional[int]:
+    value = _text(row, key)
+    if not value:
+        if required:
+            raise ValueError(f"{key} is required")
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{key} must be an integer")
+
+
+def parse_row(line: int, row) -> ImportRow:
+    if isinstance(row, RowError):
+        raise row
+    if not isinstance(row, dict):
+        raise ValueError("expected an object")
+    group_number = _int(row, "group_number", required=True)
+    group_fields = {}
+    for key, column in (("group_name", "name"), ("group_description", "description"), ("building", "building"), ("floor", "floor")):
+        value = _text(row, key)
+        if value:
+            group_fields[column] = value
+    parsed = ImportRow(line, group_number, group_fields)
+
+    parsed.point_number = _int(row, "point_number", required=False)
+    if parsed.point_number is None:
+        return parsed
+    name = _text(row, "point_name")
+    if not name:
+        raise ValueError("point_name is required when point_number is set")
+    parsed.point_fields = {"name": name}
+    for key in ("point_type", "unit"):
+        value = _text(row, key)
+        if value is not None:
+            parsed.point_fields[key] = value
+    read_only = row.get("read_only")
+    if read_only is not None:
+        if isinstance(read_only, bool):
+            parsed.point_fields["read_only"] = read_only
+        elif str(read_only).strip().lower() in _TRUE:
+            parsed.point_fields["read_only"] = True
+        elif str(read_only).strip().lower() in _FALSE:
+            parsed.point_fields["read_only"] = False
+        else:
+            raise ValueError("read_only must be true or false")
+    allowed = row.get("allowed_operations")
+    if allowed is not None:
+        if isinstance(allowed, str):
+            allowed = allowed.split(",")
+        elif not isinstance(allowed, list) or any(isinstance(item, (dict, list)) for item in allowed):
+            raise ValueError("allowed_operations must be a string or a list of strings")
+        allowed = [str(item).strip() for item in allowed if str(item).strip()]
+        parsed.point_fields["allowed_operations"] = allowed or None
+    return parsed
+
+
+def _apply_batch(db: Session, batch: List[ImportRow], result: ImportResult):
+    numbers = {row.group_number for row in batch}
+    groups = {group.group_number: group for group in db.query(Group).filter(Group.group_number.in_(numbers))}
+    updated_groups = set(groups) - result.seen_groups
+    created_groups = set()
+    for row in batch:
+        group = groups.get(row.group_number)
+        if group is None:
+            if "name" not in row.group_fields:
+                result.add_error(row.line, f"group_name is required for new group {row.group_number}")
+                continue
+            group = Group(group_number=row.group_number)
+            db.add(group)
+            groups[row.group_number] = group
+            created_groups.add(row.group_number)
+        for column, value in row.group_fields.items():
+            setattr(group, column, value)
+    db.flush()
+
+    group_ids = [group.id for group in groups.values()]
+    point_numbers = {row.point_number for row in batch if row.point_number is not None}
+    points = {}
+    if point_numbers:
+        for point in db.query(Point).filter(Point.group_id.in_(group_ids), Point.point_number.in_(point_numbers)):
+            points[(point.group_id, point.point_number)] = point
+    points_created = points_updated = 0
+    for row in batch:
+        group = groups.get(row.group_number)
+        if row.point_number is None or group is None:
+            continue
+        key = (group.id, row.point_number)
+        point = points.get(key)
+        if point is None:
+            point = Point(group_id=group.id, point_number=row.point_number)
+            db.add(point)
+            points[key] = point
+            points_created += 1
+        else:
+            points_updated += 1
+        for column, value in row.point_fields.items():
+            setattr(point, column, value)
+    db.commit()
+    # Counted only once committed, so a rolled-back batch is not reported as applied.
+    result.groups_created += len(created_groups)
+    result.groups_updated += len(updated_groups)
+    result.points_created += points_created
+    result.points_updated += points_updated
+    result.seen_groups.update(groups)
+
+
+def import_rows(db: Session, rows: Iterable[Tuple[int, object]], batch_size: int = 500) -> ImportResult:
+    """Validate rows and upsert groups and points, committing every `batch_size` rows.
+
+    Groups are matched on group_number and points on (group, point_number).
+    Invalid rows are skipped and reported; a batch that fails to commit is
+    rolled back and reported against its first line. If the file itself
+    cannot be read any further, the rows before that point are still applied
+    and the result carries `fatal_error`.
+    """
+    result = ImportResult()
+    batch: List[ImportRow] = []
+
+    def flush():
+        if not batch:
+            return
+        try:
+            _apply_batch(db, batch, result)
+        except SQLAlchemyError as exc:
+            db.rollback()
+            result.add_error(batch[0].line, f"batch of {len(batch)} rows failed: {exc.__class__.__name__}")
+            logger.exception("bulk_import_batch_failed", extra={"event": "bulk_import_batch_failed"})
+        batch.clear()
+
+    try:
+        for line, row in rows:
+            result.rows += 1
+            try:
+                batch.append(parse_row(line, row))
+            except ValueError as exc:
+                result.add_error(line, str(exc))
+            if len(batch) >= batch_size:
+                flush()
+    except (ValueError, csv.Error) as exc:
+        result.fatal_error = str(exc)
+        logger.warning("bulk_import_aborted error=%s", exc, extra={"event": "bulk_import_aborted"})
+    flush()
+    return result
+
+
+def iter_export_rows(db: Session, batch_size: int = 1000) -> Iterator[dict]:
+    query = (
+        db.query(Group, Point)
+        .outerjoin(Point, Point.group_id == Group.id)
+        .order_by(Group.group_number.asc(), Point.point_number.asc())
+        .yield_per(batch_size)
+    )
+    for group, point in query:
+        row = {
+            "group_number": group.group_number,
+            "group_name": group.name,
+            "group_description": group.description or "",
+            "building": group.building or "",
+            "floor": group.floor or "",
+            "point_number": None,
+            "point_name": "",
+            "point_type": "",
+            "unit": "",
+            "read_only": False,
+            "allowed_operations": [],
+        }
+        if point is not None:
+            row.update(
+                {
+                    "point_number": point.point_number,
+                    "point_name": point.name,
+                    "point_type": point.point_type or "",
+                    "unit": point.unit or "",
+                    "read_only": bool(point.read_only),
+                    "allowed_operations": point.allowed_operations or [],
+                }
+            )
+        yield row
+
+
+def export_csv(db: Session) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+    writer.writeheader()
+    for row in iter_export_rows(db):
+        row = dict(row)
+        row["point_number"] = "" if row["point_number"] is None else row["point_number"]
+        row["read_only"] = "true" if row["read_only"] else "false"
+        row["allowed_operations"] = ",".join(row["allowed_operations"])
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def export_json(db: Session) -> Iterator[str]:
+    yield "["
+    separator = "\n"
+    for row in iter_export_rows(db):
+        yield separator + json.dumps(row)
+        separator = ",\n"
+    yield "\n]\n"
+
+
+def export(db: Session, fmt: str) -> Iterator[str]:
+    if fmt == FORMAT_JSON:
+        return export_json(db)
+    if fmt == FORMAT_CSV:
+        return export_csv(db)
+    raise ValueError(f"Unsupported format: {fmt}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import or export groups and points.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="upsert groups and points from a CSV or JSON file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=[FORMAT_CSV, FORMAT_JSON])
+    import_parser.add_argument("--batch-size", type=int, default=500)
+    export_parser = commands.add_parser("export", help="write all groups and points as CSV or JSON")
+    export_parser.add_argument("--format", choices=[FORMAT_CSV, FORMAT_JSON], default=FORMAT_CSV)
+    export_parser.add_argument("--output", help="file to write instead of stdout")
+    args = parser.parse_args(argv)
+
+    init_db()
+    with get_db_session() as db:
+        if args.command == "import":
+            fmt = args.format or detect_format(args.path)
+            with open(args.path, "rb") as stream:
+                result = import_rows(db, iter_rows(stream, fmt), batch_size=args.batch_size)
+            print(json.dumps(result.to_dict(), indent=2))
+            if result.error_count or result.fatal_error:
+                sys.exit(1)
+            return
+        output = open(args.output, "w", newline="") if args.output else sys.stdout
+        try:
+            for chunk in export(db, args.format):
+                output.write(chunk)
+        finally:
+            if args.output:
+                output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -38,14 +38,25 @@ class Settings:
     serial_bytesize: int = _get_int("SERIAL_BYTESIZE", 8)
     serial_parity: str = os.getenv("SERIAL_PARITY", "N")
     serial_stopbits: int = _get_int("SERIAL_STOPBITS", 1)
+    serial_trace_file: str = os.getenv("SERIAL_TRACE_FILE", "")
 
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
     log_file: str = os.getenv("LOG_FILE", "./app.log")
     log_debug_screens: bool = _get_bool("LOG_DEBUG_SCREENS", False)
 
+    user_cache_ttl: float = float(os.getenv("USER_CACHE_TTL", "60"))
+    user_cache_size: int = _get_int("USER_CACHE_SIZE", 1024)
+    admin_page_size: int = _get_int("ADMIN_PAGE_SIZE", 100)
+    render_cache_size: int = _get_int("RENDER_CACHE_SIZE", 0)
+    metrics_token: str = os.getenv("METRICS_TOKEN", "")
+
     worker_poll_interval: float = float(os.getenv("WORKER_POLL_INTERVAL", "1.0"))
     terminal_main_menu_hint: str = os.getenv("TERMINAL_MAIN_MENU_HINT", "Main Menu")
     terminal_login_hint: str = os.getenv("TERMINAL_LOGIN_HINT", "Password")
     terminal_login_password: str = os.getenv("TERMINAL_LOGIN_PASSWORD", "")
+    terminal_quiet_gap: float = float(os.getenv("TERMINAL_QUIET_GAP", "0.3"))
+    terminal_esc_delay: float = float(os.getenv("TERMINAL_ESC_DELAY", "0.2"))
+    terminal_adaptive_timing: bool = _get_bool("TERMINAL_ADAPTIVE_TIMING", True)
+    terminal_timing_file: str = os.getenv("TERMINAL_TIMING_FILE", "./terminal_timing.json")
 
 settings = Settings()
@@ -1,5 +1,5 @@
 from contextlib import contextmanager
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
 from .config import settings
 from .models import Base, User, ROLE_ADMIN
@@ -21,8 +21,44 @@ def get_db_session():
         db.close()
 
 
+# Columns and indexes added to existing tables since the first release.
+# create_all only creates missing tables, so databases created by an older
+# version get them here. Every step is safe to run again.
+ADDED_COLUMNS = [
+    ("jobs", "timings_json", "JSON"),
+    ("groups", "updated_at", "DATETIME"),
+    ("points", "updated_at", "DATETIME"),
+    ("points", "change_seq", "INTEGER"),
+]
+# Run once, right after the column is added.
+BACKFILLS = {
+    # Give values read before the upgrade a sequence so a sync from 0 returns them.
+    ("points", "change_seq"): "UPDATE points SET change_seq = id WHERE last_value IS NOT NULL",
+}
+ADDED_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_jobs_status ON jobs (status)",
+    "CREATE INDEX IF NOT EXISTS ix_points_change_seq ON points (change_seq)",
+    "CREATE INDEX IF NOT EXISTS ix_points_group_id_point_number ON points (group_id, point_number)",
+    "CREATE INDEX IF NOT EXISTS ix_groups_building ON groups (building)",
+    "CREATE INDEX IF NOT EXISTS ix_groups_floor ON groups (floor)",
+]
+
+
+def upgrade_schema():
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table, column, ddl in ADDED_COLUMNS:
+            if column not in {existing["name"] for existing in inspector.get_columns(table)}:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+                if (table, column) in BACKFILLS:
+                    conn.execute(text(BACKFILLS[(table, column)]))
+        for statement in ADDED_INDEXES:
+            conn.execute(text(statement))
+
+
 def init_db():
     Base.metadata.create_all(bind=engine)
+    upgrade_schema()
     with get_db_session() as db:
         existing = db.query(User).first()
         if existing:
@@ -0,0 +1,73 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request
+
+from .config import settings
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:24]
+    return f'W/"{digest}"'
+
+
+def latest(*values: Optional[datetime]) -> Optional[datetime]:
+    present = [value for value in values if value is not None]
+    return max(present) if present else None
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime]) -> dict:
+    # no-cache lets browsers keep the page but revalidate every time, which is what makes 304s possible.
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or etag[2:] in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+
+class RenderCache:
+    """LRU cache of rendered pages keyed by ETag. A size of 0 disables it."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: str, body: str):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+render_cache = RenderCache(settings.render_cache_size)
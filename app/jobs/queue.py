@@ -1,6 +1,6 @@
 from datetime import datetime
 from sqlalchemy.orm import Session
-from ..models import Job, JOB_PENDING
+from ..models import Job, JOB_PENDING, JOB_RUNNING
 
 
 def create_job(db: Session, created_by_user_id: int, job_type: str, payload: dict) -> Job:
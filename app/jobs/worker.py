@@ -1,46 +1,93 @@
+import itertools
 import json
 import logging
 import time
 from datetime import datetime
+from sqlalchemy import func
+from typing import Optional
 from sqlalchemy.orm import Session
 from ..config import settings
-from ..db import get_db_session
-from ..logging_config import configure_logging
+from ..db import get_db_session, init_db
+from ..logging_config import configure_logging, screen_for_log
+from ..metrics import REGISTRY, PhaseTimer
 from ..models import (
     JOB_COMMAND_POINT,
     JOB_FAILED,
     JOB_READ_GROUP,
+    JOB_READ_POINT,
     JOB_SUCCEEDED,
     Point,
     Job,
+    WorkerMetrics,
 )
 from ..terminal.driver import TerminalDriver
 from .queue import claim_next_job
 
 logger = logging.getLogger(__name__)
 
+JOBS_TOTAL = REGISTRY.counter("metasys_jobs_total", "Jobs finished by type and status.", ("type", "status"))
+JOB_DURATION = REGISTRY.histogram("metasys_job_duration_seconds", "Time from claim to finish by job type.", ("type",))
+JOB_QUEUE_WAIT = REGISTRY.histogram("metasys_job_queue_wait_seconds", "Time jobs waited in the queue by job type.", ("type",))
+JOB_PHASE_SECONDS = REGISTRY.counter("metasys_job_phase_seconds_total", "Worker time spent in each job phase.", ("phase",))
+SERIAL_BYTES = REGISTRY.counter("metasys_serial_bytes_total", "Bytes exchanged with the panel.", ("direction",))
+TERMINAL_LOGINS = REGISTRY.counter("metasys_terminal_logins_total", "Terminal logins performed.")
+PARSE_FAILURES = REGISTRY.counter("metasys_parse_failures_total", "Panel screens that yielded no point value.", ("type",))
 
-def _handle_read_group(db: Session, driver: TerminalDriver, job: Job) -> dict:
+
+def _change_sequence(db: Session):
+    # Only the worker writes point values, so max + 1 is safe without a database sequence.
+    current = db.query(func.max(Point.change_seq)).scalar() or 0
+    return itertools.count(current + 1)
+
+
+def _store_point_value(db_point: Point, value: str, sequence):
+    if db_point.last_value != value:
+        db_point.change_seq = next(sequence)
+    db_point.last_value = value
+    db_point.last_updated_at = datetime.utcnow()
+
+
+def _handle_read_group(db: Session, driver: TerminalDriver, job: Job, phases: Optional[PhaseTimer] = None) -> dict:
+    phases = phases or PhaseTimer()
     group_number = job.payload_json.get("group_number")
     result = driver.read_group_values(group_number)
     points = result.get("points", [])
-    for point in points:
-        if point.point_number is None:
-            continue
-        db_point = (
-            db.query(Point)
-            .filter(Point.group_id == job.payload_json.get("group_id"))
-            .filter(Point.point_number == point.point_number)
-            .first()
-        )
-        if db_point:
-            db_point.last_value = point.value
-            db_point.last_updated_at = datetime.utcnow()
-    db.commit()
+    if not any(point.point_number is not None for point in points):
+        PARSE_FAILURES.inc(type=job.type)
+    with phases.phase("db"):
+        sequence = _change_sequence(db)
+        for point in points:
+            if point.point_number is None:
+                continue
+            db_point = (
+                db.query(Point)
+                .filter(Point.group_id == job.payload_json.get("group_id"))
+                .filter(Point.point_number == point.point_number)
+                .first()
+            )
+            if db_point:
+                _store_point_value(db_point, point.value, sequence)
+        db.commit()
     result["points"] = [p.__dict__ for p in points]
     return result
 
 
+def _handle_read_point(db: Session, driver: TerminalDriver, job: Job, phases: Optional[PhaseTimer] = None) -> dict:
+    phases = phases or PhaseTimer()
+    payload = job.payload_json
+    result = driver.read_point_value(payload.get("group_number"), payload.get("point_number"))
+    if result.get("value") is None:
+        PARSE_FAILURES.inc(type=job.type)
+        raise ValueError(f"No point value on panel screen; raw_screen:\n{result.get('raw_screen')}")
+    with phases.phase("db"):
+        db_point = db.query(Point).filter(Point.id == payload.get("point_id")).first()
+        if db_point:
+            _store_point_value(db_point, result["value"], _change_sequence(db))
+            db.commit()
+    result["point_id"] = payload.get("point_id")
+    return result
+
+
 def _handle_command_point(db: Session, driver: TerminalDriver, job: Job) -> dict:
     payload = job.payload_json
     point = db.query(Point).filter(Point.id == payload.get("point_id")).first()
@@ -63,14 +110,47 @@ def _handle_command_point(db: Session, driver: TerminalDriver, job: Job) -> dict
         payload.get("point_id"),
         old_value,
         payload.get("command_value"),
-        result.get("raw_screen"),
+        screen_for_log(result.get("raw_screen")),
         extra={"event": "command_executed", "job_id": job.id, "user_id": job.created_by_user_id},
     )
     return result
 
 
+def _record_job_metrics(db: Session, driver: TerminalDriver, job: Job, phases: PhaseTimer, counts_before: tuple):
+    bytes_written, bytes_read, logins = counts_before
+    queue_wait = (job.started_at - job.created_at).total_seconds() if job.started_at and job.created_at else 0.0
+    duration = (job.finished_at - job.started_at).total_seconds() if job.started_at else 0.0
+    totals = dict(phases.totals)
+    timings = {
+        "queue_wait": queue_wait,
+        "total": duration,
+        "phases": totals,
+        "serial_bytes_out": driver.bytes_written - bytes_written,
+        "serial_bytes_in": driver.bytes_read - bytes_read,
+        "logins": driver.login_count - logins,
+    }
+    job.timings_json = timings
+
+    JOBS_TOTAL.inc(type=job.type, status=job.status)
+    JOB_DURATION.observe(duration, type=job.type)
+    JOB_QUEUE_WAIT.observe(queue_wait, type=job.type)
+    for phase, seconds in totals.items():
+        JOB_PHASE_SECONDS.inc(seconds, phase=phase)
+    SERIAL_BYTES.inc(timings["serial_bytes_out"], direction="out")
+    SERIAL_BYTES.inc(timings["serial_bytes_in"], direction="in")
+    TERMINAL_LOGINS.inc(timings["logins"])
+
+    row = db.query(WorkerMetrics).first()
+    if row is None:
+        row = WorkerMetrics()
+        db.add(row)
+    row.data_json = REGISTRY.snapshot()
+    row.updated_at = datetime.utcnow()
+
+
 def run_worker():
     configure_logging()
+    init_db()
     driver = TerminalDriver()
     logger.info("worker_start", extra={"event": "worker_start"})
     while True:
@@ -80,22 +160,30 @@ def run_worker():
                 time.sleep(settings.worker_poll_interval)
                 continue
             logger.info("job_claimed", extra={"event": "job_claimed", "job_id": job.id, "user_id": job.created_by_user_id})
+            phases = PhaseTimer()
+            driver.phases = phases
+            counts_before = (driver.bytes_written, driver.bytes_read, driver.login_count)
             try:
-                if job.type == JOB_READ_GROUP:
-                    result = _handle_read_group(db, driver, job)
-                elif job.type == JOB_COMMAND_POINT:
-                    result = _handle_command_point(db, driver, job)
-                else:
-                    raise ValueError(f"Unknown job type: {job.type}")
+                with phases.phase("other"):
+                    if job.type == JOB_READ_GROUP:
+                        result = _handle_read_group(db, driver, job, phases)
+                    elif job.type == JOB_READ_POINT:
+                        result = _handle_read_point(db, driver, job, phases)
+                    elif job.type == JOB_COMMAND_POINT:
+                        result = _handle_command_point(db, driver, job)
+                    else:
+                        raise ValueError(f"Unknown job type: {job.type}")
                 job.result_json = result
                 job.status = JOB_SUCCEEDED
                 job.finished_at = datetime.utcnow()
+                _record_job_metrics(db, driver, job, phases, counts_before)
                 db.commit()
                 logger.info("job_succeeded", extra={"event": "job_succeeded", "job_id": job.id, "user_id": job.created_by_user_id})
             except Exception as exc:
                 job.status = JOB_FAILED
                 job.error = str(exc)
                 job.finished_at = datetime.utcnow()
+                _record_job_metrics(db, driver, job, phases, counts_before)
                 db.commit()
                 logger.exception("job_failed", extra={"event": "job_failed", "job_id": job.id, "user_id": job.created_by_user_id})
         time.sleep(0.1)
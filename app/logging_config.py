@@ -1,8 +1,16 @@
+import atexit
 import logging
 import json
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from .config import settings
 
+SCREEN_PREVIEW_CHARS = 160
+
+_listener = None
+_queue_handler = None
+
+
 class JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         payload = {
@@ -19,7 +27,47 @@ class JsonFormatter(logging.Formatter):
         return json.dumps(payload)
 
 
+class _MessageOnlyFormatter(logging.Formatter):
+    # QueueHandler.prepare merges args on the calling thread; keep that to the bare message.
+    def format(self, record: logging.LogRecord) -> str:
+        return record.getMessage()
+
+
+def screen_for_log(screen):
+    """Return a raw screen capture as it should appear in a log line.
+
+    Full screens are only logged with LOG_DEBUG_SCREENS; otherwise a short
+    preview is kept. The full capture stays available in the job result.
+    """
+    if screen is None or settings.log_debug_screens:
+        return screen
+    screen = " ".join(screen.split())
+    if len(screen) <= SCREEN_PREVIEW_CHARS:
+        return screen
+    return f"{screen[:SCREEN_PREVIEW_CHARS]}...(+{len(screen) - SCREEN_PREVIEW_CHARS} chars)"
+
+
+def stop_logging():
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
 def configure_logging():
+    """Route log records through a queue to a listener thread that formats and writes them.
+
+    Callers only enqueue records, so file I/O and rotation never block the
+    serial worker. Calling this again replaces the previous pipeline.
+    """
+    global _listener, _queue_handler
+    stop_logging()
+
     logger = logging.getLogger()
     logger.setLevel(settings.log_level.upper())
 
@@ -27,8 +75,16 @@ def configure_logging():
 
     stream_handler = logging.StreamHandler()
     stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
 
     file_handler = RotatingFileHandler(settings.log_file, maxBytes=1_000_000, backupCount=3)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = QueueHandler(log_queue)
+    _queue_handler.setFormatter(_MessageOnlyFormatter())
+    logger.addHandler(_queue_handler)
+    _listener = QueueListener(log_queue, stream_handler, file_handler, respect_handler_level=True)
+    _listener.start()
+
+
+atexit.register(stop_logging)
@@ -1,23 +1,34 @@
-from fastapi import Depends, FastAPI, Form, HTTPException, Request, status
-from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi import Depends, FastAPI, File, Form, HTTPException, Request, UploadFile, status
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, RedirectResponse, Response, StreamingResponse
+from datetime import datetime
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import contains_eager
 from fastapi.templating import Jinja2Templates
 from starlette.middleware.sessions import SessionMiddleware
 
 from .auth.deps import get_current_user, require_admin, get_db
 from .auth.routes import router as auth_router
 from .auth.security import hash_password
+from .auth.user_cache import user_cache
+from .bulk import FORMAT_CSV, FORMAT_JSON, detect_format, export, import_rows, iter_rows
 from .config import settings
-from .db import init_db
+from .db import get_db_session, init_db
+from .http_cache import cache_headers, is_not_modified, latest, make_etag, render_cache
 from .jobs.queue import create_job
 from .logging_config import configure_logging
+from .metrics import REGISTRY, Registry, render
 from .models import (
     Group,
     Job,
     JOB_COMMAND_POINT,
+    JOB_PENDING,
     JOB_READ_GROUP,
+    JOB_READ_POINT,
+    JOB_RUNNING,
     Point,
     ROLE_ADMIN,
     User,
+    WorkerMetrics,
 )
 
 configure_logging()
@@ -35,21 +46,45 @@ async def root(request: Request):
         return RedirectResponse("/groups", status_code=status.HTTP_303_SEE_OTHER)
     return RedirectResponse("/login", status_code=status.HTTP_303_SEE_OTHER)
 
+def _cached_page(request: Request, template: str, etag: str, last_modified, build_context):
+    headers = cache_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    body = render_cache.get(etag)
+    if body is None:
+        body = templates.get_template(template).render(build_context())
+        render_cache.put(etag, body)
+    return HTMLResponse(body, headers=headers)
+
 @app.get("/groups")
 async def groups_list(request: Request, user=Depends(get_current_user), db=Depends(get_db)):
-    groups = db.query(Group).order_by(Group.group_number.asc()).all()
-    return templates.TemplateResponse("groups.html", {"request": request, "user": user, "groups": groups})
+    last_modified, group_count = db.query(func.max(Group.updated_at), func.count(Group.id)).one()
+    etag = make_etag("groups", user.role, request.url.query, last_modified, group_count)
+
+    def build_context():
+        groups = db.query(Group).order_by(Group.group_number.asc()).all()
+        return {"request": request, "user": user, "groups": groups}
+
+    return _cached_page(request, "groups.html", etag, last_modified, build_context)
 
 @app.get("/groups/{group_id}")
 async def group_detail(group_id: int, request: Request, user=Depends(get_current_user), db=Depends(get_db)):
     group = db.query(Group).filter(Group.id == group_id).first()
     if not group:
         raise HTTPException(status_code=404)
-    points = db.query(Point).filter(Point.group_id == group.id).order_by(Point.point_number.asc()).all()
-    return templates.TemplateResponse(
-        "group_detail.html",
-        {"request": request, "user": user, "group": group, "points": points},
+    values_at, config_at, point_count = (
+        db.query(func.max(Point.last_updated_at), func.max(Point.updated_at), func.count(Point.id))
+        .filter(Point.group_id == group.id)
+        .one()
     )
+    last_modified = latest(values_at, config_at, group.updated_at)
+    etag = make_etag("group", group.id, user.role, request.url.query, values_at, config_at, group.updated_at, point_count)
+
+    def build_context():
+        points = db.query(Point).filter(Point.group_id == group.id).order_by(Point.point_number.asc()).all()
+        return {"request": request, "user": user, "group": group, "points": points}
+
+    return _cached_page(request, "group_detail.html", etag, last_modified, build_context)
 
 @app.post("/groups/{group_id}/refresh")
 async def refresh_group(group_id: int, request: Request, user=Depends(get_current_user), db=Depends(get_db)):
@@ -64,6 +99,27 @@ async def refresh_group(group_id: int, request: Request, user=Depends(get_curren
     )
     return RedirectResponse(f"/groups/{group_id}?job_id={job.id}", status_code=status.HTTP_303_SEE_OTHER)
 
+@app.post("/points/{point_id}/read")
+async def read_point(point_id: int, request: Request, user=Depends(get_current_user), db=Depends(get_db)):
+    point = db.query(Point).filter(Point.id == point_id).first()
+    if not point:
+        raise HTTPException(status_code=404)
+    group = db.query(Group).filter(Group.id == point.group_id).first()
+    if not group:
+        raise HTTPException(status_code=404)
+    job = create_job(
+        db,
+        created_by_user_id=user.id,
+        job_type=JOB_READ_POINT,
+        payload={
+            "group_id": group.id,
+            "group_number": group.group_number,
+            "point_id": point.id,
+            "point_number": point.point_number,
+        },
+    )
+    return RedirectResponse(f"/groups/{group.id}?job_id={job.id}", status_code=status.HTTP_303_SEE_OTHER)
+
 @app.post("/points/{point_id}/command")
 async def command_point(
     point_id: int,
@@ -109,16 +165,94 @@ async def job_status(job_id: int, user=Depends(get_current_user), db=Depends(get
             "status": job.status,
             "result": job.result_json,
             "error": job.error,
+            "timings": job.timings_json,
             "created_at": job.created_at.isoformat() if job.created_at else None,
             "started_at": job.started_at.isoformat() if job.started_at else None,
             "finished_at": job.finished_at.isoformat() if job.finished_at else None,
         }
     )
 
+@app.get("/api/points")
+async def api_points(since: int = 0, limit: int = 1000, user=Depends(get_current_user), db=Depends(get_db)):
+    limit = max(1, min(limit, 5000))
+    rows = (
+        db.query(Point)
+        .filter(Point.change_seq > since)
+        .order_by(Point.change_seq.asc())
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return JSONResponse(
+        {
+            "points": [
+                {
+                    "id": point.id,
+                    "group_id": point.group_id,
+                    "point_number": point.point_number,
+                    "name": point.name,
+                    "unit": point.unit,
+                    "value": point.last_value,
+                    "updated_at": point.last_updated_at.isoformat() if point.last_updated_at else None,
+                    "seq": point.change_seq,
+                }
+                for point in rows
+            ],
+            "cursor": rows[-1].change_seq if rows else since,
+            "has_more": has_more,
+        }
+    )
+
+@app.get("/metrics")
+async def metrics(request: Request, db=Depends(get_db)):
+    if settings.metrics_token and request.headers.get("authorization") != f"Bearer {settings.metrics_token}":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    live = Registry()
+    queue_depth = live.gauge("metasys_queue_depth", "Jobs pending or running.", ("status",))
+    counts = dict(
+        db.query(Job.status, func.count(Job.id))
+        .filter(Job.status.in_([JOB_PENDING, JOB_RUNNING]))
+        .group_by(Job.status)
+        .all()
+    )
+    for job_status_value in (JOB_PENDING, JOB_RUNNING):
+        queue_depth.set(counts.get(job_status_value, 0), status=job_status_value)
+    snapshots = [live.snapshot(), REGISTRY.snapshot()]
+    worker_metrics = db.query(WorkerMetrics).first()
+    if worker_metrics:
+        snapshots.append(worker_metrics.data_json)
+    return PlainTextResponse(render(*snapshots), media_type="text/plain; version=0.0.4")
+
+def _parse_cursor(after: str, *types):
+    parts = after.split("|")
+    if len(parts) != len(types):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    try:
+        return tuple(cast(part) for cast, part in zip(types, parts))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _keyset_page(request: Request, query, cursor_of):
+    rows = query.limit(settings.admin_page_size + 1).all()
+    next_url = None
+    if len(rows) > settings.admin_page_size:
+        rows = rows[: settings.admin_page_size]
+        cursor = "|".join(str(part) for part in cursor_of(rows[-1]))
+        next_url = str(request.url.include_query_params(after=cursor))
+    return rows, next_url
+
 @app.get("/admin/users")
-async def admin_users(request: Request, user=Depends(require_admin), db=Depends(get_db)):
-    users = db.query(User).order_by(User.created_at.desc()).all()
-    return templates.TemplateResponse("admin/users.html", {"request": request, "user": user, "users": users})
+async def admin_users(request: Request, after: str = "", user=Depends(require_admin), db=Depends(get_db)):
+    query = db.query(User).order_by(User.created_at.desc(), User.id.desc())
+    if after:
+        created_at, last_id = _parse_cursor(after, datetime.fromisoformat, int)
+        query = query.filter(tuple_(User.created_at, User.id) < (created_at, last_id))
+    users, next_url = _keyset_page(request, query, lambda u: (u.created_at.isoformat(), u.id))
+    return templates.TemplateResponse(
+        "admin/users.html",
+        {"request": request, "user": user, "users": users, "next_url": next_url},
+    )
 
 @app.get("/admin/users/new")
 async def admin_user_new(request: Request, user=Depends(require_admin)):
@@ -163,6 +297,7 @@ async def admin_user_update(
     if password:
         edit_user.password_hash = hash_password(password)
     db.commit()
+    user_cache.invalidate(user_id)
     return RedirectResponse("/admin/users", status_code=status.HTTP_303_SEE_OTHER)
 
 @app.post("/admin/users/{user_id}/delete")
@@ -171,12 +306,37 @@ async def admin_user_delete(user_id: int, request: Request, user=Depends(require
     if delete_user:
         db.delete(delete_user)
         db.commit()
+    user_cache.invalidate(user_id)
     return RedirectResponse("/admin/users", status_code=status.HTTP_303_SEE_OTHER)
 
 @app.get("/admin/groups")
-async def admin_groups(request: Request, user=Depends(require_admin), db=Depends(get_db)):
-    groups = db.query(Group).order_by(Group.group_number.asc()).all()
-    return templates.TemplateResponse("admin/groups.html", {"request": request, "user": user, "groups": groups})
+async def admin_groups(
+    request: Request,
+    building: str = "",
+    floor: str = "",
+    after: str = "",
+    user=Depends(require_admin),
+    db=Depends(get_db),
+):
+    query = db.query(Group).order_by(Group.group_number.asc())
+    if building:
+        query = query.filter(Group.building == building)
+    if floor:
+        query = query.filter(Group.floor == floor)
+    if after:
+        (last_number,) = _parse_cursor(after, int)
+        query = query.filter(Group.group_number > last_number)
+    groups, next_url = _keyset_page(request, query, lambda g: (g.group_number,))
+    return templates.TemplateResponse(
+        "admin/groups.html",
+        {
+            "request": request,
+            "user": user,
+            "groups": groups,
+            "next_url": next_url,
+            "filters": {"building": building, "floor": floor},
+        },
+    )
 
 @app.get("/admin/groups/new")
 async def admin_group_new(request: Request, user=Depends(require_admin)):
@@ -243,12 +403,44 @@ async def admin_group_delete(group_id: int, request: Request, user=Depends(requi
     return RedirectResponse("/admin/groups", status_code=status.HTTP_303_SEE_OTHER)
 
 @app.get("/admin/points")
-async def admin_points(request: Request, user=Depends(require_admin), db=Depends(get_db)):
-    points = db.query(Point).order_by(Point.group_id.asc(), Point.point_number.asc()).all()
-    groups = db.query(Group).order_by(Group.group_number.asc()).all()
+async def admin_points(
+    request: Request,
+    group_id: str = "",
+    building: str = "",
+    floor: str = "",
+    after: str = "",
+    user=Depends(require_admin),
+    db=Depends(get_db),
+):
+    query = (
+        db.query(Point)
+        .join(Point.group)
+        .options(contains_eager(Point.group))
+        .order_by(Point.group_id.asc(), Point.point_number.asc(), Point.id.asc())
+    )
+    if group_id:
+        if not group_id.isdigit():
+            raise HTTPException(status_code=400, detail="Invalid group")
+        query = query.filter(Point.group_id == int(group_id))
+    if building:
+        query = query.filter(Group.building == building)
+    if floor:
+        query = query.filter(Group.floor == floor)
+    if after:
+        cursor = _parse_cursor(after, int, int, int)
+        query = query.filter(tuple_(Point.group_id, Point.point_number, Point.id) > cursor)
+    points, next_url = _keyset_page(request, query, lambda p: (p.group_id, p.point_number, p.id))
+    groups = db.query(Group.id, Group.group_number, Group.name).order_by(Group.group_number.asc()).all()
     return templates.TemplateResponse(
         "admin/points.html",
-        {"request": request, "user": user, "points": points, "groups": groups},
+        {
+            "request": request,
+            "user": user,
+            "points": points,
+            "groups": groups,
+            "next_url": next_url,
+            "filters": {"group_id": group_id, "building": building, "floor": floor},
+        },
     )
 
 @app.get("/admin/points/new")
@@ -333,6 +525,40 @@ async def admin_point_update(
 async def admin_point_delete(point_id: int, request: Request, user=Depends(require_admin), db=Depends(get_db)):
     delete_point = db.query(Point).filter(Point.id == point_id).first()
     if delete_point:
+        # The point's own timestamps go with it; touch the group so Last-Modified moves forward.
+        delete_point.group.updated_at = datetime.utcnow()
         db.delete(delete_point)
         db.commit()
     return RedirectResponse("/admin/points", status_code=status.HTTP_303_SEE_OTHER)
+
+# Plain def so the blocking upload read and database writes run in the threadpool.
+@app.post("/admin/import")
+def admin_import(
+    request: Request,
+    user=Depends(require_admin),
+    db=Depends(get_db),
+    file: UploadFile = File(...),
+    format: str = Form(""),
+):
+    fmt = format or detect_format(file.filename)
+    if fmt not in (FORMAT_CSV, FORMAT_JSON):
+        raise HTTPException(status_code=400, detail="Unsupported format")
+    result = import_rows(db, iter_rows(file.file, fmt))
+    return JSONResponse(result.to_dict(), status_code=400 if result.fatal_error else 200)
+
+@app.get("/admin/export")
+async def admin_export(format: str = FORMAT_CSV, user=Depends(require_admin)):
+    if format not in (FORMAT_CSV, FORMAT_JSON):
+        raise HTTPException(status_code=400, detail="Unsupported format")
+    media_type = "text/csv" if format == FORMAT_CSV else "application/json"
+
+    # Request-scoped sessions are closed before a streamed body is sent, so the export owns its own.
+    def stream():
+        with get_db_session() as db:
+            yield from export(db, format)
+
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="points.{format}"'},
+    )
@@ -0,0 +1,157 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (), lock: Optional[threading.Lock] = None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Tuple[str, ...], object] = {}
+        self._lock = lock or threading.Lock()
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            values = [[list(key), list(value) if isinstance(value, list) else value] for key, value in self.values.items()]
+        return {"type": self.type, "help": self.help, "labelnames": list(self.labelnames), "values": values}
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS, lock=None):
+        super().__init__(name, help, labelnames, lock)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            # Non-cumulative bucket counts, then sum and count.
+            state = self.values.setdefault(key, [0] * len(self.buckets) + [0, 0.0, 0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data["buckets"] = list(self.buckets)
+        return data
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, help: str, labelnames=(), **kwargs):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = cls(name, help, labelnames, lock=self._lock, **kwargs)
+            self.metrics[name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames=()) -> Counter:
+        return self._register(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames=()) -> Gauge:
+        return self._register(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help, labelnames, buckets=buckets)
+
+    def snapshot(self) -> dict:
+        return {name: metric.to_dict() for name, metric in self.metrics.items()}
+
+
+def _format_labels(names: List[str], values: List[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def render(*snapshots: dict) -> str:
+    """Render registry snapshots in the Prometheus text exposition format."""
+    lines = []
+    for snapshot in snapshots:
+        for name, metric in sorted(snapshot.items()):
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            labelnames = metric["labelnames"]
+            for labelvalues, value in metric["values"]:
+                if metric["type"] != "histogram":
+                    lines.append(f"{name}{_format_labels(labelnames, labelvalues)} {value}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric["buckets"] + ["+Inf"], value):
+                    cumulative += count
+                    le = ("le", bound if isinstance(bound, str) else repr(float(bound)))
+                    lines.append(f"{name}_bucket{_format_labels(labelnames, labelvalues, le)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labelnames, labelvalues)} {value[-2]}")
+                lines.append(f"{name}_count{_format_labels(labelnames, labelvalues)} {value[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+# Metrics recorded by the current process. The worker persists its snapshot to
+# the worker_metrics table so the web process can serve it on /metrics.
+REGISTRY = Registry()
+
+
+class PhaseTimer:
+    """Accumulates exclusive wall time per named phase.
+
+    Phases may nest; time spent in an inner phase is not counted again in
+    the outer one, so the values add up to the total elapsed time.
+    """
+
+    def __init__(self):
+        self.totals: Dict[str, float] = {}
+        self._stack: List[list] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        entry = [name, time.monotonic(), 0.0]
+        self._stack.append(entry)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.monotonic() - entry[1]
+            self.totals[name] = self.totals.get(name, 0.0) + elapsed - entry[2]
+            if self._stack:
+                self._stack[-1][2] += elapsed
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.sqlite import JSON
 from sqlalchemy.orm import declarative_base, relationship
 
@@ -15,6 +15,7 @@ JOB_FAILED = "FAILED"
 
 JOB_READ_GROUP = "READ_GROUP"
 JOB_COMMAND_POINT = "COMMAND_POINT"
+JOB_READ_POINT = "READ_POINT"
 
 class User(Base):
     __tablename__ = "users"
@@ -34,13 +35,15 @@ class Group(Base):
     group_number = Column(Integer, unique=True, nullable=False)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    building = Column(String(255), nullable=True)
-    floor = Column(String(255), nullable=True)
+    building = Column(String(255), nullable=True, index=True)
+    floor = Column(String(255), nullable=True, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     points = relationship("Point", back_populates="group", cascade="all, delete-orphan")
 
 class Point(Base):
     __tablename__ = "points"
+    __table_args__ = (Index("ix_points_group_id_point_number", "group_id", "point_number"),)
 
     id = Column(Integer, primary_key=True)
     point_number = Column(Integer, nullable=False)
@@ -52,6 +55,8 @@ class Point(Base):
     unit = Column(String(50), nullable=True)
     last_value = Column(String(255), nullable=True)
     last_updated_at = Column(DateTime, nullable=True)
+    change_seq = Column(Integer, nullable=True, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     group = relationship("Group", back_populates="points")
 
@@ -62,11 +67,19 @@ class Job(Base):
     created_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     type = Column(String(50), nullable=False)
     payload_json = Column(JSON, nullable=False)
-    status = Column(String(20), nullable=False, default=JOB_PENDING)
+    status = Column(String(20), nullable=False, default=JOB_PENDING, index=True)
     result_json = Column(JSON, nullable=True)
+    timings_json = Column(JSON, nullable=True)
     error = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     started_at = Column(DateTime, nullable=True)
     finished_at = Column(DateTime, nullable=True)
 
     created_by = relationship("User", back_populates="jobs")
+
+class WorkerMetrics(Base):
+    __tablename__ = "worker_metrics"
+
+    id = Column(Integer, primary_key=True)
+    data_json = Column(JSON, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
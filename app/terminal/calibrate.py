@@ -0,0 +1,28 @@
+import argparse
+import json
+
+from ..logging_config import configure_logging
+from .driver import TerminalDriver
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure panel response times and store learned serial waits.")
+    parser.add_argument("--group", type=int, required=True, help="group number to open while measuring")
+    parser.add_argument("--point", type=int, default=None, help="point number to also open on the detail screen")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--reset", action="store_true", help="discard previously learned samples first")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    driver = TerminalDriver()
+    if args.reset:
+        driver.timing.reset()
+    try:
+        summary = driver.calibrate(args.group, args.point, args.rounds)
+    finally:
+        driver.close()
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,19 @@ except ImportError:  # pragma: no cover - optional at test time
     serial = None
 
 from ..config import settings
+from ..metrics import PhaseTimer
+from .timing import (
+    SCREEN_COMMAND,
+    SCREEN_GROUP_SUMMARY,
+    SCREEN_LOGIN,
+    SCREEN_MENU,
+    SCREEN_POINT_DETAIL,
+    TimingProfile,
+)
+from .trace import TraceRecorder
+
+# Per-read serial timeout inside `_read_screen`.
+POLL_INTERVAL = 0.02
 
 @dataclass
 class ParsedPoint:
@@ -17,6 +30,11 @@ class ParsedPoint:
     value: str
     raw_line: str
 
+@dataclass
+class PointDetail:
+    value: Optional[str]
+    status: Optional[str]
+
 class ScreenBuffer:
     def __init__(self, rows: int = 24, cols: int = 80):
         self.rows = rows
@@ -58,94 +76,184 @@ class ScreenBuffer:
         return "\n".join(line.rstrip() for line in self.buffer)
 
 class TerminalDriver:
-    def __init__(self):
-        self.serial = None
+    def __init__(self, timing: Optional[TimingProfile] = None, transport=None):
+        self.serial = transport
         self.screen = ScreenBuffer()
+        self.timing = timing if timing is not None else TimingProfile.from_settings()
+        self.phases = PhaseTimer()
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.login_count = 0
 
     def connect(self):
-        if serial is None:
-            raise RuntimeError("pyserial is not installed")
         if self.serial and self.serial.is_open:
             return
-        self.serial = serial.Serial(
-            port=settings.serial_port,
-            baudrate=settings.serial_baud,
-            timeout=settings.serial_timeout,
-            write_timeout=settings.serial_write_timeout,
-            bytesize=settings.serial_bytesize,
-            parity=settings.serial_parity,
-            stopbits=settings.serial_stopbits,
-        )
+        if serial is None:
+            raise RuntimeError("pyserial is not installed")
+        with self.phases.phase("connect"):
+            port = serial.Serial(
+                port=settings.serial_port,
+                baudrate=settings.serial_baud,
+                timeout=settings.serial_timeout,
+                write_timeout=settings.serial_write_timeout,
+                bytesize=settings.serial_bytesize,
+                parity=settings.serial_parity,
+                stopbits=settings.serial_stopbits,
+            )
+        if settings.serial_trace_file:
+            port = TraceRecorder(port, settings.serial_trace_file)
+        self.serial = port
 
     def close(self):
+        self.timing.save()
         if self.serial and self.serial.is_open:
             self.serial.close()
 
     def send(self, text: str):
         if not self.serial:
             raise RuntimeError("Serial port not open")
-        self.serial.write(text.encode("ascii"))
-
-    def _read_for(self, seconds: float = 1.0) -> str:
-        start = time.time()
-        last_data = time.time()
-        while time.time() - start < seconds:
-            if not self.serial:
-                break
-            data = self.serial.read(1024)
-            if data:
-                self.screen.feed(data)
-                last_data = time.time()
-            else:
-                if time.time() - last_data > 0.3:
+        data = text.encode("ascii")
+        self.serial.write(data)
+        self.bytes_written += len(data)
+
+    def _read_for(self, seconds: float = 1.0, screen_type: Optional[str] = None, expect: Optional[str] = None) -> str:
+        with self.phases.phase("serial_read"):
+            return self._read_screen(seconds, screen_type, expect)
+
+    def _read_screen(self, seconds: float, screen_type: Optional[str], expect: Optional[str] = None) -> str:
+        if not self.serial:
+            return self.screen.text()
+        window = self.timing.read_window(screen_type, seconds)
+        first_byte_wait = self.timing.first_byte_wait(screen_type, seconds)
+        quiet_gap = self.timing.quiet_gap(screen_type)
+        port = self.serial
+        # Poll in short reads so the quiet gap, not SERIAL_TIMEOUT, decides when a screen is done.
+        saved_timeout = getattr(port, "timeout", None)
+        polling = saved_timeout is not None and saved_timeout > POLL_INTERVAL
+        if polling:
+            port.timeout = POLL_INTERVAL
+        start = time.monotonic()
+        first_data = None
+        last_data = start
+        max_gap = 0.0
+        complete = False
+        try:
+            while time.monotonic() - start < window:
+                size = max(1, port.in_waiting) if hasattr(port, "in_waiting") else 1024
+                data = port.read(size)
+                now = time.monotonic()
+                if data:
+                    self.bytes_read += len(data)
+                    self.screen.feed(data)
+                    if first_data is None:
+                        first_data = now
+                    else:
+                        max_gap = max(max_gap, now - last_data)
+                    last_data = now
+                elif first_data is None:
+                    if now - start > first_byte_wait:
+                        break
+                elif now - last_data > quiet_gap:
+                    complete = True
                     break
-        return self.screen.text()
+        finally:
+            if polling:
+                port.timeout = saved_timeout
+        screen = self.screen.text()
+        if screen_type:
+            if complete and (expect is None or expect in screen):
+                self.timing.record(screen_type, first_data - start, last_data - start, max_gap)
+            else:
+                self.timing.record_miss(screen_type, seconds)
+        return screen
 
     def go_to_main_menu(self) -> str:
         self.connect()
-        for _ in range(5):
-            self.send("\x1b")
-            time.sleep(0.2)
-            screen = self._read_for(1.0)
-            if settings.terminal_login_hint in screen:
-                screen = self._handle_login(screen)
-            if settings.terminal_main_menu_hint in screen:
-                return screen
-        return self._read_for(1.0)
+        with self.phases.phase("navigate"):
+            for _ in range(5):
+                self.send("\x1b")
+                time.sleep(self.timing.esc_delay())
+                screen = self._read_for(1.0, SCREEN_MENU)
+                if settings.terminal_login_hint in screen:
+                    screen = self._handle_login(screen)
+                if settings.terminal_main_menu_hint in screen:
+                    return screen
+            return self._read_for(1.0, SCREEN_MENU)
 
     def _handle_login(self, screen: str) -> str:
         if not settings.terminal_login_password:
             return screen
-        self.send(settings.terminal_login_password)
-        self.send("\r")
-        return self._read_for(2.0)
+        with self.phases.phase("login"):
+            self.login_count += 1
+            self.send(settings.terminal_login_password)
+            self.send("\r")
+            return self._read_for(2.0, SCREEN_LOGIN, expect=settings.terminal_main_menu_hint)
 
     def open_group_summary(self, group_number: int) -> str:
         self.go_to_main_menu()
-        self.send("G")
-        self.send("S")
-        self.send(str(group_number))
-        self.send("\r")
-        return self._read_for(2.0)
+        with self.phases.phase("navigate"):
+            self.send("G")
+            self.send("S")
+            self.send(str(group_number))
+            self.send("\r")
+            return self._read_for(2.0, SCREEN_GROUP_SUMMARY)
 
     def read_group_values(self, group_number: int) -> dict:
         screen = self.open_group_summary(group_number)
-        parsed = parse_group_summary(screen)
+        with self.phases.phase("parse"):
+            parsed = parse_group_summary(screen)
+        if not any(point.point_number is not None for point in parsed):
+            self.timing.record_miss(SCREEN_GROUP_SUMMARY, 2.0)
         return {"group_number": group_number, "points": parsed, "raw_screen": screen}
 
+    def open_point_detail(self, group_number: int, point_number: int) -> str:
+        self.open_group_summary(group_number)
+        with self.phases.phase("navigate"):
+            self.send(str(point_number))
+            self.send("\r")
+            return self._read_for(2.0, SCREEN_POINT_DETAIL)
+
+    def read_point_value(self, group_number: int, point_number: int) -> dict:
+        screen = self.open_point_detail(group_number, point_number)
+        with self.phases.phase("parse"):
+            detail = parse_point_detail(screen)
+        if detail.value is None:
+            self.timing.record_miss(SCREEN_POINT_DETAIL, 2.0)
+        return {
+            "group_number": group_number,
+            "point_number": point_number,
+            "value": detail.value,
+            "status": detail.status,
+            "raw_screen": screen,
+        }
+
     def command_point(self, group_number: int, point_number: int, command_type: str, command_value: str) -> dict:
         screen = self.open_group_summary(group_number)
-        self.send(str(point_number))
-        self.send("\r")
-        self._read_for(1.0)
-        self.send(command_type)
-        self.send("\r")
-        self._read_for(0.5)
-        self.send(command_value)
-        self.send("\r")
-        screen = self._read_for(2.0)
+        with self.phases.phase("command"):
+            self.send(str(point_number))
+            self.send("\r")
+            self._read_for(1.0, SCREEN_POINT_DETAIL)
+            self.send(command_type)
+            self.send("\r")
+            self._read_for(0.5, SCREEN_COMMAND)
+            self.send(command_value)
+            self.send("\r")
+            screen = self._read_for(2.0, SCREEN_COMMAND)
         return {"raw_screen": screen}
 
+    def calibrate(self, group_number: int, point_number: Optional[int] = None, rounds: int = 5) -> dict:
+        adaptive = self.timing.adaptive
+        self.timing.adaptive = False
+        try:
+            for _ in range(rounds):
+                self.open_group_summary(group_number)
+                if point_number is not None:
+                    self.open_point_detail(group_number, point_number)
+        finally:
+            self.timing.adaptive = adaptive
+            self.timing.save()
+        return self.timing.summary()
+
 
 def parse_group_summary(screen_text: str) -> List[ParsedPoint]:
     points = []
@@ -163,3 +271,11 @@ def parse_group_summary(screen_text: str) -> List[ParsedPoint]:
                 continue
             points.append(ParsedPoint(None, "", "", line))
     return points
+
+
+def parse_point_detail(screen_text: str) -> PointDetail:
+    fields = {}
+    for line in screen_text.splitlines():
+        for match in re.finditer(r"\b(Value|Status)\s*[:=]\s*(.*?)(?=\s{2,}\S+\s*[:=]|\s*$)", line, re.IGNORECASE):
+            fields.setdefault(match.group(1).lower(), match.group(2))
+    return PointDetail(fields.get("value"), fields.get("status"))
@@ -0,0 +1,257 @@
+import argparse
+import json
+import logging
+import os
+import random
+import select
+import time
+import tty
+from typing import Dict, Optional
+
+from ..config import settings
+from ..logging_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+CLEAR = "\x1b[2J"
+
+STATE_LOGIN = "login"
+STATE_MAIN_MENU = "main_menu"
+STATE_GROUP_MENU = "group_menu"
+STATE_GROUP_NUMBER = "group_number"
+STATE_GROUP_SUMMARY = "group_summary"
+STATE_COMMAND_TYPE = "command_type"
+STATE_COMMAND_VALUE = "command_value"
+
+
+class PanelSimulator:
+    """Screen state machine of a Metasys terminal, independent of any transport.
+
+    `handle` consumes bytes typed by the client and returns the bytes the
+    panel would send back. Points are `{group_number: {point_number: [name, value]}}`.
+    """
+
+    def __init__(self, points: Dict[int, Dict[int, list]], password: str = "", drift: float = 0.0):
+        self.points = points
+        self.password = password
+        self.drift = drift
+        self.logged_in = not password
+        self.state = STATE_MAIN_MENU if self.logged_in else STATE_LOGIN
+        self.entry = ""
+        self.group_number: Optional[int] = None
+        self.point_number: Optional[int] = None
+        self.command_type = ""
+
+    @classmethod
+    def generate(cls, groups: int, points_per_group: int, **kwargs) -> "PanelSimulator":
+        points = {
+            group: {point: [f"Point {group}-{point}", f"{random.uniform(60, 80):.1f}"] for point in range(1, points_per_group + 1)}
+            for group in range(1, groups + 1)
+        }
+        return cls(points, **kwargs)
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "PanelSimulator":
+        with open(path) as handle:
+            data = json.load(handle)
+        points = {
+            int(group): {int(point): [name, str(value)] for point, (name, value) in group_points.items()}
+            for group, group_points in data.items()
+        }
+        return cls(points, **kwargs)
+
+    def _screen(self, *lines: str) -> bytes:
+        return (CLEAR + "\r\n".join(lines) + "\r\n").encode("ascii", errors="replace")
+
+    def login_screen(self) -> bytes:
+        return self._screen("Metasys Operator Terminal", "", f"Enter {settings.terminal_login_hint}:")
+
+    def main_menu_screen(self) -> bytes:
+        return self._screen(settings.terminal_main_menu_hint, "", "G  Groups", "", "Select:")
+
+    def group_summary_screen(self) -> bytes:
+        group_points = self.points.get(self.group_number)
+        if group_points is None:
+            return self._screen(f"Group {self.group_number} not defined", "", "Group Number:")
+        lines = [f"For Group Number: {self.group_number}", "Point  Name                    Value"]
+        for number, entry in sorted(group_points.items()):
+            entry[1] = self._drifted(entry[1])
+            lines.append(f"{number:>3}    {entry[0]:<22}  {entry[1]}")
+        lines.extend(["", "Point Number:"])
+        return self._screen(*lines)
+
+    def point_detail_screen(self) -> bytes:
+        name, value = self.points[self.group_number][self.point_number]
+        return self._screen(
+            f"Group {self.group_number}  Point {self.point_number}   {name}",
+            "",
+            f"Value: {value}    Status: Normal",
+            "",
+            "Command:",
+        )
+
+    def _drifted(self, value: str) -> str:
+        if not self.drift:
+            return value
+        try:
+            return f"{float(value) + random.uniform(-self.drift, self.drift):.1f}"
+        except ValueError:
+            return value
+
+    def handle(self, data: bytes) -> bytes:
+        output = b""
+        for ch in data.decode("ascii", errors="ignore"):
+            output += self._key(ch)
+        return output
+
+    def _key(self, ch: str) -> bytes:
+        if ch == "\x1b":
+            self.entry = ""
+            if not self.logged_in:
+                self.state = STATE_LOGIN
+                return self.login_screen()
+            self.state = STATE_MAIN_MENU
+            return self.main_menu_screen()
+        if self.state == STATE_MAIN_MENU:
+            if ch.upper() == "G":
+                self.state = STATE_GROUP_MENU
+                return self._screen("Groups", "", "S  Summary", "", "Select:")
+            return b""
+        if self.state == STATE_GROUP_MENU:
+            if ch.upper() == "S":
+                self.state = STATE_GROUP_NUMBER
+                return self._screen("Group Summary", "", "Group Number:")
+            return b""
+        if ch != "\r":
+            self.entry += ch
+            return ch.encode("ascii", errors="replace") if self.state != STATE_LOGIN else b"*"
+        entry, self.entry = self.entry.strip(), ""
+        return self._enter(entry)
+
+    def _enter(self, entry: str) -> bytes:
+        if self.state == STATE_LOGIN:
+            if entry == self.password:
+                self.logged_in = True
+                self.state = STATE_MAIN_MENU
+                return self.main_menu_screen()
+            return self.login_screen()
+        if self.state == STATE_GROUP_NUMBER:
+            if not entry.isdigit():
+                return self._screen("Group Summary", "", "Group Number:")
+            self.group_number = int(entry)
+            if self.group_number in self.points:
+                self.state = STATE_GROUP_SUMMARY
+            return self.group_summary_screen()
+        if self.state == STATE_GROUP_SUMMARY:
+            if not entry.isdigit() or int(entry) not in self.points[self.group_number]:
+                return self.group_summary_screen()
+            self.point_number = int(entry)
+            self.state = STATE_COMMAND_TYPE
+            return self.point_detail_screen()
+        if self.state == STATE_COMMAND_TYPE:
+            self.command_type = entry
+            self.state = STATE_COMMAND_VALUE
+            return b"\r\nValue:"
+        if self.state == STATE_COMMAND_VALUE:
+            self.points[self.group_number][self.point_number][1] = entry
+            self.state = STATE_GROUP_SUMMARY
+            logger.info(
+                "simulator_command group=%s point=%s type=%s value=%s",
+                self.group_number,
+                self.point_number,
+                self.command_type,
+                entry,
+                extra={"event": "simulator_command"},
+            )
+            return self._screen(f"Command {self.command_type} {entry} accepted", "", "Point Number:")
+        return b""
+
+
+class SimulatorTransport:
+    """In-process serial transport backed by a simulator, for tests without a pty."""
+
+    def __init__(self, simulator: PanelSimulator):
+        self.simulator = simulator
+        self.is_open = True
+        self._pending = b""
+
+    def write(self, data: bytes):
+        self._pending += self.simulator.handle(bytes(data))
+        return len(data)
+
+    def read(self, size: int = 1024) -> bytes:
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def close(self):
+        self.is_open = False
+
+
+def serve(simulator: PanelSimulator, baud: int = 9600, delay: float = 0.0, link: Optional[str] = None):
+    """Serve `simulator` on a new pseudo-terminal until interrupted.
+
+    `baud` paces output at ten bit times per byte (0 disables pacing) and
+    `delay` is added before each response.
+    """
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    path = os.ttyname(slave)
+    if link:
+        if os.path.lexists(link):
+            os.remove(link)
+        os.symlink(path, link)
+        path = link
+    print(f"SERIAL_PORT={path}", flush=True)
+    logger.info("simulator_start port=%s", path, extra={"event": "simulator_start"})
+    byte_time = 10.0 / baud if baud else 0.0
+    try:
+        while True:
+            readable, _, _ = select.select([master], [], [], 1.0)
+            if not readable:
+                continue
+            data = os.read(master, 1024)
+            response = simulator.handle(data)
+            if not response:
+                continue
+            if delay:
+                time.sleep(delay)
+            if not byte_time:
+                os.write(master, response)
+                continue
+            # Write in small chunks so pacing resembles a real line rather than one burst.
+            for index in range(0, len(response), 64):
+                chunk = response[index : index + 64]
+                os.write(master, chunk)
+                time.sleep(len(chunk) * byte_time)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        os.close(master)
+        os.close(slave)
+        if link and os.path.islink(link):
+            os.remove(link)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate a Metasys panel terminal on a pseudo-terminal.")
+    parser.add_argument("--groups", type=int, default=10)
+    parser.add_argument("--points", type=int, default=20, help="points per generated group")
+    parser.add_argument("--config", help="JSON file of {group: {point: [name, value]}} instead of generated points")
+    parser.add_argument("--baud", type=int, default=settings.serial_baud, help="pace output at this rate, 0 for unpaced")
+    parser.add_argument("--delay", type=float, default=0.05, help="seconds before each response")
+    parser.add_argument("--drift", type=float, default=0.5, help="random change applied to values on each summary")
+    parser.add_argument("--password", default=settings.terminal_login_password)
+    parser.add_argument("--link", help="also expose the pty at this path, e.g. /tmp/metasys-sim")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    options = {"password": args.password, "drift": args.drift}
+    if args.config:
+        simulator = PanelSimulator.from_file(args.config, **options)
+    else:
+        simulator = PanelSimulator.generate(args.groups, args.points, **options)
+    serve(simulator, baud=args.baud, delay=args.delay, link=args.link)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import json
+import logging
+import os
+from collections import deque
+from typing import Dict, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+SCREEN_MENU = "menu"
+SCREEN_LOGIN = "login"
+SCREEN_GROUP_SUMMARY = "group_summary"
+SCREEN_POINT_DETAIL = "point_detail"
+SCREEN_COMMAND = "command"
+
+MIN_WAIT = 0.05
+
+
+def _percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class ScreenTiming:
+    """Rolling samples of how one screen type paints over the serial line."""
+
+    def __init__(self, window: int = 50):
+        self.first_byte = deque(maxlen=window)
+        self.complete = deque(maxlen=window)
+        self.max_gap = deque(maxlen=window)
+
+    def __len__(self):
+        return len(self.complete)
+
+    def record(self, first_byte: float, complete: float, max_gap: float):
+        self.first_byte.append(first_byte)
+        self.complete.append(complete)
+        self.max_gap.append(max_gap)
+
+    def to_dict(self) -> dict:
+        return {
+            "first_byte": list(self.first_byte),
+            "complete": list(self.complete),
+            "max_gap": list(self.max_gap),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, window: int = 50) -> "ScreenTiming":
+        timing = cls(window)
+        for first_byte, complete, max_gap in zip(
+            data.get("first_byte", []), data.get("complete", []), data.get("max_gap", [])
+        ):
+            timing.record(first_byte, complete, max_gap)
+        return timing
+
+
+class TimingProfile:
+    """Learned serial waits per screen type.
+
+    Each `_read_for` call reports time to first byte, time to the last byte
+    and the largest gap between chunks. Once a screen type has `min_samples`
+    samples its waits are derived from the 95th percentile times `margin`,
+    never exceeding the configured defaults or, for the first byte and the
+    whole screen, the caller's read window. A read cut short by a tight wait
+    cannot observe the longer timing, so it is recorded as a miss at those
+    limits instead; enough misses pull the waits back up.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        adaptive: bool = True,
+        quiet_gap: float = 0.3,
+        esc_delay: float = 0.2,
+        window: int = 50,
+        min_samples: int = 5,
+        margin: float = 1.5,
+        save_every: int = 10,
+    ):
+        self.path = path
+        self.adaptive = adaptive
+        self.default_quiet_gap = quiet_gap
+        self.default_esc_delay = esc_delay
+        self.window = window
+        self.min_samples = min_samples
+        self.margin = margin
+        self.save_every = save_every
+        self.screens: Dict[str, ScreenTiming] = {}
+        self._unsaved = 0
+
+    @classmethod
+    def from_settings(cls) -> "TimingProfile":
+        profile = cls(
+            path=settings.terminal_timing_file or None,
+            adaptive=settings.terminal_adaptive_timing,
+            quiet_gap=settings.terminal_quiet_gap,
+            esc_delay=settings.terminal_esc_delay,
+        )
+        profile.load()
+        return profile
+
+    def _learned(self, screen_type: Optional[str]) -> Optional[ScreenTiming]:
+        if not self.adaptive or screen_type is None:
+            return None
+        timing = self.screens.get(screen_type)
+        if timing is None or len(timing) < self.min_samples:
+            return None
+        return timing
+
+    def record(self, screen_type: str, first_byte: float, complete: float, max_gap: float):
+        timing = self.screens.setdefault(screen_type, ScreenTiming(self.window))
+        timing.record(first_byte, complete, max_gap)
+        self._unsaved += 1
+        if self.save_every and self._unsaved >= self.save_every:
+            self.save()
+
+    def record_miss(self, screen_type: str, seconds: float):
+        """Record a read with window `seconds` that timed out or returned an incomplete screen."""
+        self.record(screen_type, seconds, seconds, self.default_quiet_gap)
+
+    def quiet_gap(self, screen_type: Optional[str]) -> float:
+        timing = self._learned(screen_type)
+        if timing is None:
+            return self.default_quiet_gap
+        learned = _percentile(timing.max_gap, 0.95) * self.margin
+        return min(self.default_quiet_gap, max(MIN_WAIT, learned))
+
+    def first_byte_wait(self, screen_type: Optional[str], default: float) -> float:
+        timing = self._learned(screen_type)
+        if timing is None:
+            return default
+        learned = _percentile(timing.first_byte, 0.95) * self.margin
+        return min(default, max(MIN_WAIT, learned))
+
+    def read_window(self, screen_type: Optional[str], default: float) -> float:
+        timing = self._learned(screen_type)
+        if timing is None:
+            return default
+        learned = _percentile(timing.complete, 0.95) * self.margin + self.quiet_gap(screen_type)
+        return min(default, max(MIN_WAIT, learned))
+
+    def esc_delay(self) -> float:
+        timing = self._learned(SCREEN_MENU)
+        if timing is None:
+            return self.default_esc_delay
+        return min(self.default_esc_delay, max(MIN_WAIT, _percentile(timing.first_byte, 0.95)))
+
+    def reset(self):
+        self.screens = {}
+        self._unsaved = 0
+
+    def summary(self) -> dict:
+        result = {"esc_delay": self.esc_delay(), "screens": {}}
+        for screen_type, timing in sorted(self.screens.items()):
+            result["screens"][screen_type] = {
+                "samples": len(timing),
+                "first_byte_p95": _percentile(timing.first_byte, 0.95),
+                "complete_p95": _percentile(timing.complete, 0.95),
+                "first_byte_wait": self.first_byte_wait(screen_type, settings.serial_timeout),
+                "quiet_gap": self.quiet_gap(screen_type),
+            }
+        return result
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            logger.warning("timing_profile_unreadable", extra={"event": "timing_profile_unreadable"})
+            return
+        self.screens = {
+            screen_type: ScreenTiming.from_dict(samples, self.window)
+            for screen_type, samples in data.get("screens", {}).items()
+        }
+
+    def save(self):
+        self._unsaved = 0
+        if not self.path:
+            return
+        data = {"screens": {screen_type: timing.to_dict() for screen_type, timing in self.screens.items()}}
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as handle:
+                json.dump(data, handle)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            logger.warning("timing_profile_save_failed", extra={"event": "timing_profile_save_failed"})
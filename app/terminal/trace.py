@@ -0,0 +1,158 @@
+import struct
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from ..config import settings
+
+TRACE_MAGIC = b"MTRACE1\n"
+DIRECTION_WRITE = b"W"
+DIRECTION_READ = b"R"
+
+# offset from the start of the trace in seconds, direction, payload length
+_RECORD = struct.Struct("<dcI")
+
+
+@dataclass
+class TraceEvent:
+    offset: float
+    direction: bytes
+    data: bytes
+
+
+def read_trace(path: str) -> List[TraceEvent]:
+    events = []
+    with open(path, "rb") as handle:
+        if handle.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+            raise ValueError(f"Not a serial trace file: {path}")
+        while True:
+            header = handle.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                break
+            offset, direction, length = _RECORD.unpack(header)
+            data = handle.read(length)
+            if len(data) < length:
+                break
+            events.append(TraceEvent(offset, direction, data))
+    return events
+
+
+class TraceRecorder:
+    """Wraps a serial port and appends every write and non-empty read to a trace file.
+
+    The file is truncated when the recorder is created, so each worker start
+    replaces the previous trace.
+    """
+
+    def __init__(self, port, path: str):
+        self.port = port
+        self._file = open(path, "wb")
+        self._file.write(TRACE_MAGIC)
+        self._start = time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        return self.port.is_open
+
+    @property
+    def in_waiting(self) -> int:
+        return self.port.in_waiting
+
+    @property
+    def timeout(self):
+        return self.port.timeout
+
+    @timeout.setter
+    def timeout(self, value):
+        self.port.timeout = value
+
+    def _record(self, direction: bytes, data: bytes):
+        self._file.write(_RECORD.pack(time.monotonic() - self._start, direction, len(data)))
+        self._file.write(data)
+        # Flushed per record so a crash or kill leaves a readable trace up to that point.
+        self._file.flush()
+
+    def write(self, data: bytes):
+        written = self.port.write(data)
+        self._record(DIRECTION_WRITE, bytes(data))
+        return written
+
+    def read(self, size: int = 1024) -> bytes:
+        data = self.port.read(size)
+        if data:
+            self._record(DIRECTION_READ, data)
+        return data
+
+    def close(self):
+        self.port.close()
+        if not self._file.closed:
+            self._file.close()
+
+
+class ReplaySerial:
+    """Serial transport that plays a recorded trace back to the driver.
+
+    Read chunks are released relative to the write that preceded them in the
+    recording, so the panel's response latency is reproduced even when the
+    driver under test writes at different moments. `speed` > 1 compresses
+    those delays; the driver's own waits still run in wall time.
+    """
+
+    def __init__(self, events, speed: float = 1.0, timeout: Optional[float] = None, strict: bool = False):
+        if isinstance(events, str):
+            events = read_trace(events)
+        self.events = list(events)
+        self.speed = speed
+        self.timeout = settings.serial_timeout if timeout is None else timeout
+        self.strict = strict
+        self.is_open = True
+        self.written = []
+        self._cursor = 0
+        self._pending = b""
+        self._anchor_time = time.monotonic()
+        self._anchor_offset = 0.0
+
+    def _next_index(self, direction: bytes) -> Optional[int]:
+        for index in range(self._cursor, len(self.events)):
+            if self.events[index].direction == direction:
+                return index
+        return None
+
+    def write(self, data: bytes):
+        data = bytes(data)
+        self.written.append(data)
+        index = self._next_index(DIRECTION_WRITE)
+        if index is None:
+            if self.strict:
+                raise ValueError(f"Unexpected write past end of trace: {data!r}")
+            return len(data)
+        event = self.events[index]
+        if self.strict and event.data != data:
+            raise ValueError(f"Trace expected write {event.data!r}, got {data!r}")
+        # Reads recorded before this write stay queued; everything after is timed from now.
+        self.events.pop(index)
+        self._anchor_time = time.monotonic()
+        self._anchor_offset = event.offset
+        return len(data)
+
+    def read(self, size: int = 1024) -> bytes:
+        if not self._pending:
+            timeout = self.timeout / self.speed
+            if self._cursor >= len(self.events) or self.events[self._cursor].direction != DIRECTION_READ:
+                time.sleep(timeout)
+                return b""
+            event = self.events[self._cursor]
+            due = self._anchor_time + max(0.0, event.offset - self._anchor_offset) / self.speed
+            wait = due - time.monotonic()
+            if wait > timeout:
+                time.sleep(timeout)
+                return b""
+            if wait > 0:
+                time.sleep(wait)
+            self._cursor += 1
+            self._pending = event.data
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def close(self):
+        self.is_open = False
@@ -0,0 +1,110 @@
+from datetime import datetime
+
+from sqlalchemy import insert, update
+
+from app.db import engine, get_db_session, init_db
+from app.jobs.queue import claim_next_job, create_job
+from app.jobs.worker import _handle_read_group
+from app.metrics import PhaseTimer
+from app.models import JOB_PENDING, JOB_READ_GROUP, JOB_SUCCEEDED, Base, Group, Job, Point, User
+from app.terminal.driver import ParsedPoint
+
+from .harness import benchmark, measure
+
+POINTS_PER_GROUP = 20
+
+
+def _reset_schema() -> int:
+    Base.metadata.drop_all(bind=engine)
+    init_db()
+    with get_db_session() as db:
+        return db.query(User).first().id
+
+
+def _fill_jobs(user_id: int, count: int, status: str = JOB_SUCCEEDED):
+    now = datetime.utcnow()
+    rows = [
+        {
+            "created_by_user_id": user_id,
+            "type": JOB_READ_GROUP,
+            "payload_json": {"group_id": 1, "group_number": 1},
+            "status": status,
+            "created_at": now,
+        }
+        for _ in range(count)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(Job), rows)
+
+
+@benchmark("queue.create_job")
+def bench_create_job(scale: int) -> dict:
+    user_id = _reset_schema()
+    _fill_jobs(user_id, 10_000 * scale)
+    batch = 200
+
+    def run():
+        with get_db_session() as db:
+            for _ in range(batch):
+                create_job(db, user_id, JOB_READ_GROUP, {"group_id": 1, "group_number": 1})
+
+    return measure(run, items=batch)
+
+
+@benchmark("queue.claim_next_job")
+def bench_claim_next_job(scale: int) -> dict:
+    user_id = _reset_schema()
+    _fill_jobs(user_id, 10_000 * scale)
+    batch = 200
+
+    def setup():
+        with engine.begin() as conn:
+            conn.execute(update(Job).values(status=JOB_SUCCEEDED))
+        _fill_jobs(user_id, batch, status=JOB_PENDING)
+
+    def run():
+        with get_db_session() as db:
+            for _ in range(batch):
+                claim_next_job(db)
+
+    return measure(run, items=batch, setup=setup)
+
+
+class _ReplayedGroupDriver:
+    """Returns a fixed parse result so only the worker's DB work is timed."""
+
+    def read_group_values(self, group_number: int) -> dict:
+        points = [
+            ParsedPoint(number, f"Point {group_number}-{number}", f"{60 + number * 0.7:.1f}", "")
+            for number in range(1, POINTS_PER_GROUP + 1)
+        ]
+        return {"group_number": group_number, "points": points, "raw_screen": ""}
+
+
+@benchmark("worker.handle_read_group")
+def bench_handle_read_group(scale: int) -> dict:
+    user_id = _reset_schema()
+    groups = 500 * scale
+    with engine.begin() as conn:
+        conn.execute(insert(Group), [{"group_number": n, "name": f"Group {n}"} for n in range(1, groups + 1)])
+        conn.execute(
+            insert(Point),
+            [
+                {"group_id": g, "point_number": p, "name": f"Point {g}-{p}"}
+                for g in range(1, groups + 1)
+                for p in range(1, POINTS_PER_GROUP + 1)
+            ],
+        )
+    sample_groups = list(range(1, groups + 1, max(1, groups // 50)))
+
+    def run():
+        with get_db_session() as db:
+            for group_id in sample_groups:
+                job = Job(
+                    created_by_user_id=user_id,
+                    type=JOB_READ_GROUP,
+                    payload_json={"group_id": group_id, "group_number": group_id},
+                )
+                _handle_read_group(db, _ReplayedGroupDriver(), job, PhaseTimer())
+
+    return measure(run, items=len(sample_groups))
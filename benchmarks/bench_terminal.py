@@ -0,0 +1,38 @@
+from app.terminal.driver import ScreenBuffer, parse_group_summary
+
+from .harness import benchmark, measure
+
+
+def synthetic_screen(group_number: int, points: int = 20) -> bytes:
+    lines = [f"For Group Number: {group_number}", "Point  Name                    Value"]
+    for number in range(1, points + 1):
+        lines.append(f"{number:>3}    {'Point %d-%d' % (group_number, number):<22}  {60 + number * 0.7:.1f}")
+    lines.extend(["", "Point Number:"])
+    return ("\x1b[2J" + "\r\n".join(lines) + "\r\n").encode("ascii")
+
+
+@benchmark("terminal.screen_buffer_feed")
+def bench_screen_buffer_feed(scale: int) -> dict:
+    screens = [synthetic_screen(group) for group in range(1, 101)]
+    buffer = ScreenBuffer()
+
+    def run():
+        for screen in screens * scale:
+            buffer.feed(screen)
+
+    return measure(run, items=len(screens) * scale)
+
+
+@benchmark("terminal.parse_group_summary")
+def bench_parse_group_summary(scale: int) -> dict:
+    texts = []
+    for group in range(1, 101):
+        buffer = ScreenBuffer()
+        buffer.feed(synthetic_screen(group))
+        texts.append(buffer.text())
+
+    def run():
+        for text in texts * scale:
+            parse_group_summary(text)
+
+    return measure(run, items=len(texts) * scale)
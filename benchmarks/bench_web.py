@@ -0,0 +1,76 @@
+from sqlalchemy import insert
+
+from app.config import settings
+from app.db import engine
+from app.models import Group, Job, JOB_READ_GROUP, JOB_SUCCEEDED, Point
+
+from .bench_db import POINTS_PER_GROUP, _reset_schema
+from .harness import benchmark, measure
+
+
+def _client(groups: int):
+    # Imported lazily: TestClient needs httpx, which the app itself does not.
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    user_id = _reset_schema()
+    with engine.begin() as conn:
+        conn.execute(insert(Group), [{"group_number": n, "name": f"Group {n}"} for n in range(1, groups + 1)])
+        conn.execute(
+            insert(Point),
+            [
+                {"group_id": g, "point_number": p, "name": f"Point {g}-{p}", "last_value": "72.4"}
+                for g in range(1, groups + 1)
+                for p in range(1, POINTS_PER_GROUP + 1)
+            ],
+        )
+        conn.execute(
+            insert(Job),
+            [
+                {
+                    "created_by_user_id": user_id,
+                    "type": JOB_READ_GROUP,
+                    "payload_json": {"group_id": 1, "group_number": 1},
+                    "status": JOB_SUCCEEDED,
+                    "result_json": {"points": []},
+                }
+            ],
+        )
+    client = TestClient(app)
+    response = client.post(
+        "/auth/login",
+        data={"email": settings.default_admin_username, "password": settings.default_admin_password},
+        follow_redirects=False,
+    )
+    if response.status_code != 303:
+        raise RuntimeError(f"login returned {response.status_code}")
+    return client
+
+
+def _requests(path: str, scale: int, groups: int = 50) -> dict:
+    client = _client(groups)
+    count = 100 * scale
+
+    def run():
+        for _ in range(count):
+            response = client.get(path)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {path} returned {response.status_code}")
+
+    return measure(run, repeat=3, items=count)
+
+
+@benchmark("web.groups_list")
+def bench_groups_list(scale: int) -> dict:
+    return _requests("/groups", scale)
+
+
+@benchmark("web.group_detail")
+def bench_group_detail(scale: int) -> dict:
+    return _requests("/groups/1", scale)
+
+
+@benchmark("web.job_status")
+def bench_job_status(scale: int) -> dict:
+    return _requests("/jobs/1", scale)
@@ -0,0 +1,45 @@
+import statistics
+import time
+from typing import Callable, Dict, List
+
+BENCHMARKS: Dict[str, Callable] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark. The function receives the scale factor and returns `measure(...)`'s result."""
+
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+
+    return decorator
+
+
+def measure(func: Callable, repeat: int = 5, number: int = 1, items: int = 1, setup: Callable = None) -> dict:
+    """Time `func` `number` times per round for `repeat` rounds.
+
+    `items` is how many units of work one call processes (screens, jobs,
+    requests) so results also report throughput. `setup` runs before each
+    round, outside the timed region.
+    """
+    samples: List[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    median = statistics.median(samples)
+    ordered = sorted(samples)
+    return {
+        "repeat": repeat,
+        "number": number,
+        "items": items,
+        "min_s": ordered[0],
+        "median_s": median,
+        "mean_s": statistics.fmean(samples),
+        "max_s": ordered[-1],
+        "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "items_per_s": items / median if median else None,
+    }
@@ -0,0 +1,107 @@
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import traceback
+from datetime import datetime
+
+MODULES = ["bench_terminal", "bench_db", "bench_web"]
+
+
+def _isolate_environment(workdir: str):
+    # Must run before any app module is imported: settings and the engine are created at import time.
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["LOG_FILE"] = os.path.join(workdir, "bench.log")
+    os.environ["LOG_LEVEL"] = "WARNING"
+    os.environ["TERMINAL_TIMING_FILE"] = ""
+
+
+def _load_modules(skipped: dict):
+    for name in MODULES:
+        try:
+            importlib.import_module(f"benchmarks.{name}")
+        except ImportError as exc:
+            skipped[name] = f"import failed: {exc}"
+
+
+def compare(results: dict, baseline: dict, threshold: float, name_filter: str = "") -> list:
+    regressions = []
+    for name, previous in sorted(baseline.get("results", {}).items()):
+        if name_filter not in name:
+            continue
+        current = results.get(name)
+        if current is None:
+            print(f"{name:<32} {previous['median_s']:.6f}s -> missing  REGRESSION", file=sys.stderr)
+            regressions.append(name)
+            continue
+        ratio = current["median_s"] / previous["median_s"] if previous["median_s"] else float("inf")
+        marker = "REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{name:<32} {previous['median_s']:.6f}s -> {current['median_s']:.6f}s  x{ratio:.2f} {marker}", file=sys.stderr)
+        if marker:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run pymetasys benchmarks and emit JSON results.")
+    parser.add_argument("--output", help="write results JSON here instead of stdout")
+    parser.add_argument("--compare", help="baseline results JSON to compare medians against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed median slowdown before failing")
+    parser.add_argument("--scale", type=int, default=1, help="multiply dataset sizes")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        _isolate_environment(workdir)
+        from .harness import BENCHMARKS
+
+        skipped = {}
+        errors = {}
+        _load_modules(skipped)
+        results = {}
+        for name, func in sorted(BENCHMARKS.items()):
+            if args.filter not in name:
+                continue
+            print(f"running {name}", file=sys.stderr)
+            try:
+                results[name] = func(args.scale)
+            except ImportError as exc:
+                skipped[name] = f"import failed: {exc}"
+            except Exception:
+                errors[name] = traceback.format_exc(limit=1).strip()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": args.scale,
+        },
+        "results": results,
+        "skipped": skipped,
+        "errors": errors,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+
+    failed = bool(errors)
+    for name, message in sorted(errors.items()):
+        print(f"{name} failed: {message}", file=sys.stderr)
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+        if compare(results, baseline, args.threshold, args.filter):
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# Settings and the engine are created at import time, so point them at a scratch
+# directory before any test imports the app.
+_workdir = tempfile.mkdtemp(prefix="pymetasys-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_workdir, 'test.db')}")
+os.environ.setdefault("LOG_FILE", os.path.join(_workdir, "test.log"))
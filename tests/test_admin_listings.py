@@ -0,0 +1,97 @@
+import html
+import re
+from datetime import datetime
+
+import pytest
+
+from app.config import settings
+from app.db import engine, get_db_session
+from app.models import Base, Group, Point, User
+
+CREATED = datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.auth.deps import get_current_user
+    from app.auth.user_cache import SessionUser
+    from app.main import app
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with get_db_session() as db:
+        for number in range(1, 6):
+            db.add(User(email=f"user{number}@example.com", password_hash="x", role="USER", created_at=CREATED))
+        north = Group(group_number=1, name="North AHU", building="North", floor="1")
+        south = Group(group_number=2, name="South AHU", building="South", floor="2")
+        db.add_all([north, south])
+        db.flush()
+        # Inserted out of order so the listing order comes from the keyset, not insertion.
+        for group, number in [(south, 2), (north, 3), (south, 1), (north, 1), (north, 2)]:
+            db.add(Point(group_id=group.id, point_number=number, name=f"{group.building} {number}"))
+        db.commit()
+    monkeypatch.setattr(settings, "admin_page_size", 2)
+    app.dependency_overrides[get_current_user] = lambda: SessionUser(1, "admin", "ADMIN")
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _walk(client, url, pattern):
+    """Follow "Next page" links from `url`, returning the ids matched on each page."""
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        pages.append([int(value) for value in re.findall(pattern, response.text)])
+        match = re.search(r'href="([^"]+)">Next page', response.text)
+        url = html.unescape(match.group(1)) if match else None
+    return pages
+
+
+def _point_ids(db, *keys):
+    points = {(point.group.group_number, point.point_number): point.id for point in db.query(Point)}
+    return [points[key] for key in keys]
+
+
+def test_users_page_by_created_at_then_id(client):
+    # Every user shares created_at, so the id breaks the tie across page boundaries.
+    assert _walk(client, "/admin/users", r"/admin/users/(\d+)/edit") == [[5, 4], [3, 2], [1]]
+
+
+def test_points_page_across_groups(client):
+    with get_db_session() as db:
+        expected = _point_ids(db, (1, 1), (1, 2), (1, 3), (2, 1), (2, 2))
+    pages = _walk(client, "/admin/points", r"/admin/points/(\d+)/edit")
+    assert pages == [expected[0:2], expected[2:4], expected[4:]]
+
+
+@pytest.mark.parametrize("query", ["building=South", "floor=2", "group_id=2"])
+def test_points_filters_keep_paging(client, query):
+    with get_db_session() as db:
+        expected = _point_ids(db, (2, 1), (2, 2))
+    assert _walk(client, f"/admin/points?{query}", r"/admin/points/(\d+)/edit") == [expected]
+
+
+def test_groups_filter(client):
+    response = client.get("/admin/groups?building=North")
+    assert "North AHU" in response.text
+    assert "South AHU" not in response.text
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/admin/users?after=yesterday|1",
+        "/admin/users?after=2024-01-01T12:00:00",
+        "/admin/groups?after=x",
+        "/admin/points?after=1|2",
+        "/admin/points?after=1|2|x",
+        "/admin/points?group_id=abc",
+    ],
+)
+def test_bad_cursor_is_rejected(client, url):
+    assert client.get(url).status_code == 400
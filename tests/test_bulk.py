@@ -0,0 +1,99 @@
+import io
+import json
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.bulk import export_csv, export_json, import_rows, iter_csv_rows, iter_json_rows
+from app.db import SessionLocal, engine
+from app.models import Base
+
+ROWS = [
+    {"group_number": 1, "group_name": "AHU 1", "building": "North", "floor": "1"},
+    {"group_number": 1, "point_number": 1, "point_name": "Supply Temp", "unit": "F", "read_only": True},
+    {"group_number": 1, "point_number": 2, "point_name": "Fan", "allowed_operations": ["START", "STOP"]},
+    {"group_number": 2, "group_name": "AHU 2", "point_number": 1, "point_name": "Return Temp"},
+]
+
+
+@pytest.fixture
+def db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _json_lines(rows):
+    return io.BytesIO("\n".join(json.dumps(row) for row in rows).encode())
+
+
+def _reset(db):
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def test_import_counts_creates_then_updates(db):
+    result = import_rows(db, iter_json_rows(_json_lines(ROWS)))
+    assert (result.rows, result.groups_created, result.points_created, result.error_count) == (4, 2, 3, 0)
+
+    result = import_rows(db, iter_json_rows(_json_lines(ROWS[1:3])))
+    assert (result.groups_created, result.groups_updated, result.points_created, result.points_updated) == (0, 1, 0, 2)
+
+
+@pytest.mark.parametrize("export, read", [(export_csv, iter_csv_rows), (export_json, iter_json_rows)])
+def test_export_round_trips(db, export, read):
+    import_rows(db, iter_json_rows(_json_lines(ROWS)))
+    exported = "".join(export(db))
+    _reset(db)
+    result = import_rows(db, read(io.BytesIO(exported.encode())))
+    assert (result.groups_created, result.points_created, result.error_count) == (2, 3, 0)
+    assert "".join(export(db)) == exported
+
+
+def test_invalid_rows_are_reported_and_skipped(db):
+    stream = io.BytesIO(
+        b'{"group_number": 1, "group_name": "AHU 1"}\n'
+        b'{"group_number": "x"}\n'
+        b"{not json\n"
+        b'{"group_number": 3, "point_number": 1, "point_name": "Temp"}\n'
+        b'{"group_number": 1, "point_number": 1, "point_name": "Temp", "read_only": "maybe"}\n'
+        b'{"group_number": 1, "point_number": 2, "point_name": "Fan"}\n'
+    )
+    result = import_rows(db, iter_json_rows(stream))
+    assert [line for line, _ in result.errors] == [2, 3, 5, 4]
+    assert (result.rows, result.groups_created, result.points_created, result.fatal_error) == (6, 1, 1, None)
+
+
+def test_malformed_array_keeps_committed_batches(db):
+    stream = io.BytesIO(b'[{"group_number": 1, "group_name": "AHU 1"}, {"group_number": 2, "group_name": "AHU 2"}, {"group_n')
+    result = import_rows(db, iter_json_rows(stream), batch_size=1)
+    assert result.fatal_error == "Invalid JSON near object 3"
+    assert result.groups_created == 2
+
+
+def test_failed_batch_is_not_counted(db, monkeypatch):
+    def fail():
+        raise OperationalError("COMMIT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(db, "commit", fail)
+    result = import_rows(db, iter_json_rows(_json_lines(ROWS)))
+    assert (result.groups_created, result.points_created, result.error_count) == (0, 0, 1)
+
+
+def test_allowed_operations_must_be_text_or_list(db):
+    rows = [
+        {"group_number": 1, "group_name": "AHU 1"},
+        {"group_number": 1, "point_number": 1, "point_name": "Fan", "allowed_operations": 5},
+        {"group_number": 1, "point_number": 2, "point_name": "Damper", "allowed_operations": [{"op": "OPEN"}]},
+        {"group_number": 1, "point_number": 3, "point_name": "Mode", "allowed_operations": [1, 2]},
+    ]
+    result = import_rows(db, iter_json_rows(_json_lines(rows)))
+    assert [line for line, _ in result.errors] == [2, 3]
+    assert (result.groups_created, result.points_created) == (1, 1)
+    exported = "".join(export_csv(db))
+    assert '"1,2"' in exported
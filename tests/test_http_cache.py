@@ -0,0 +1,105 @@
+from datetime import datetime
+
+import pytest
+
+from app.db import engine, get_db_session
+from app.http_cache import RenderCache
+from app.models import Base, Group, Point
+
+PAST = datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.auth.deps import get_current_user
+    from app.auth.user_cache import SessionUser
+    from app.main import app
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with get_db_session() as db:
+        group = Group(group_number=1, name="Group 1", updated_at=PAST)
+        db.add(group)
+        db.flush()
+        for number in (1, 2):
+            db.add(Point(group_id=group.id, point_number=number, name=f"Point {number}", last_value="70.0", last_updated_at=PAST, updated_at=PAST))
+        db.commit()
+    app.dependency_overrides[get_current_user] = lambda: SessionUser(1, "admin", "ADMIN")
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _update_point(number, **values):
+    with get_db_session() as db:
+        point = db.query(Point).filter(Point.point_number == number).one()
+        for column, value in values.items():
+            setattr(point, column, value)
+        db.commit()
+
+
+@pytest.mark.parametrize("path", ["/groups", "/groups/1"])
+def test_page_revalidates_with_etag_and_date(client, path):
+    response = client.get(path)
+    assert response.status_code == 200
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+    assert last_modified == "Mon, 01 Jan 2024 12:00:00 GMT"
+
+    response = client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert client.get(path, headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get(path, headers={"If-Modified-Since": "Sun, 31 Dec 2023 12:00:00 GMT"}).status_code == 200
+    assert client.get(path, headers={"If-None-Match": 'W/"other"'}).status_code == 200
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda: _update_point(1, last_value="71.5", last_updated_at=datetime.utcnow()),
+        lambda: _update_point(2, name="Renamed"),
+    ],
+    ids=["value", "config"],
+)
+def test_group_etag_changes_after_edit(client, change):
+    response = client.get("/groups/1")
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+    change()
+    assert client.get("/groups/1", headers={"If-None-Match": etag}).status_code == 200
+    assert client.get("/groups/1", headers={"If-Modified-Since": last_modified}).status_code == 200
+
+
+def test_point_delete_invalidates_date_check(client):
+    last_modified = client.get("/groups/1").headers["last-modified"]
+    assert client.post("/admin/points/1/delete", follow_redirects=False).status_code == 303
+    response = client.get("/groups/1", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 200
+    assert "Point 1" not in response.text
+
+
+def test_render_cache_serves_repeat_pages(client, monkeypatch):
+    import app.main
+
+    cache = RenderCache(4)
+    monkeypatch.setattr(app.main, "render_cache", cache)
+    first = client.get("/groups/1")
+    assert cache.get(first.headers["etag"]) == first.text
+    assert client.get("/groups/1").text == first.text
+
+
+def test_render_cache_evicts_least_recently_used():
+    cache = RenderCache(2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == ("A", None, "C")
+
+
+def test_render_cache_size_zero_is_disabled():
+    cache = RenderCache(0)
+    cache.put("a", "A")
+    assert cache.get("a") is None
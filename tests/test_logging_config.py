@@ -0,0 +1,34 @@
+import json
+import logging
+
+from app import logging_config
+from app.config import settings
+
+
+def test_configure_logging_is_idempotent_and_queued(tmp_path, monkeypatch):
+    log_file = tmp_path / "app.log"
+    monkeypatch.setattr(settings, "log_file", str(log_file))
+    root = logging.getLogger()
+    before = list(root.handlers)
+    try:
+        logging_config.configure_logging()
+        logging_config.configure_logging()
+        added = [h for h in root.handlers if h not in before]
+        assert len(added) == 1
+        logging.getLogger("test").warning("hello %s", "queue", extra={"event": "test_event"})
+    finally:
+        logging_config.stop_logging()
+    assert [h for h in root.handlers if h not in before] == []
+    record = json.loads(log_file.read_text().splitlines()[-1])
+    assert record["message"] == "hello queue"
+    assert record["event"] == "test_event"
+
+
+def test_screen_for_log_truncates(monkeypatch):
+    monkeypatch.setattr(settings, "log_debug_screens", False)
+    screen = "Point  Name  Value\n" * 50
+    preview = logging_config.screen_for_log(screen)
+    assert len(preview) < len(screen)
+    assert preview.endswith("chars)")
+    monkeypatch.setattr(settings, "log_debug_screens", True)
+    assert logging_config.screen_for_log(screen) == screen
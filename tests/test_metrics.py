@@ -0,0 +1,24 @@
+import time
+
+from app.metrics import PhaseTimer, Registry, render
+
+
+def test_phase_timer_excludes_nested_time():
+    timer = PhaseTimer()
+    with timer.phase("navigate"):
+        with timer.phase("serial_read"):
+            time.sleep(0.02)
+    assert timer.totals["serial_read"] >= 0.02
+    assert timer.totals["navigate"] < timer.totals["serial_read"]
+
+
+def test_render_prometheus_text():
+    registry = Registry()
+    registry.counter("jobs_total", "Jobs.", ("type",)).inc(type="READ_GROUP")
+    registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0)).observe(0.5)
+    text = render(registry.snapshot())
+    assert 'jobs_total{type="READ_GROUP"} 1.0' in text
+    assert 'latency_seconds_bucket{le="0.1"} 0' in text
+    assert 'latency_seconds_bucket{le="1.0"} 1' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 1' in text
+    assert "latency_seconds_count 1" in text
@@ -0,0 +1,61 @@
+import itertools
+
+import pytest
+
+from app.db import engine, get_db_session
+from app.jobs.worker import _store_point_value
+from app.models import Base, Group, Point
+
+
+def test_store_point_value_advances_sequence_only_on_change():
+    sequence = itertools.count(1)
+    point = Point(last_value="70.0")
+    _store_point_value(point, "70.0", sequence)
+    assert point.change_seq is None
+    assert point.last_updated_at is not None
+    _store_point_value(point, "71.0", sequence)
+    assert point.change_seq == 1
+    _store_point_value(point, "71.0", sequence)
+    assert point.change_seq == 1
+    _store_point_value(point, "72.5", sequence)
+    assert point.change_seq == 2
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.auth.deps import get_current_user
+    from app.auth.user_cache import SessionUser
+    from app.main import app
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with get_db_session() as db:
+        group = Group(group_number=1, name="Group 1")
+        db.add(group)
+        db.flush()
+        for number, seq in enumerate([3, 1, None, 5, 2], start=1):
+            db.add(Point(group_id=group.id, point_number=number, name=f"Point {number}", last_value=f"{number}.0", change_seq=seq))
+        db.commit()
+    app.dependency_overrides[get_current_user] = lambda: SessionUser(1, "admin", "ADMIN")
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_api_points_pages_by_cursor(client):
+    pages = []
+    since = 0
+    while True:
+        data = client.get("/api/points", params={"since": since, "limit": 2}).json()
+        pages.append(([point["seq"] for point in data["points"]], data["has_more"]))
+        since = data["cursor"]
+        if not data["has_more"]:
+            break
+    assert pages == [([1, 2], True), ([3, 5], False)]
+    assert since == 5
+
+    data = client.get("/api/points", params={"since": since}).json()
+    assert (data["points"], data["cursor"], data["has_more"]) == ([], 5, False)
@@ -1,4 +1,4 @@
-from app.terminal.driver import ScreenBuffer, parse_group_summary
+from app.terminal.driver import ScreenBuffer, parse_group_summary, parse_point_detail
 
 
 def test_screen_buffer_basic():
@@ -22,3 +22,14 @@ def test_parse_group_summary_lines():
     assert points[0].point_number == 1
     assert points[0].name == "Temp Supply"
     assert points[0].value == "72.4"
+
+
+def test_parse_point_detail_fields():
+    sample = """
+    Group 2  Point 1   Temp Supply
+    Value: 72.4 DEG F    Status: Normal
+    """
+    detail = parse_point_detail(sample)
+    assert detail.value == "72.4 DEG F"
+    assert detail.status == "Normal"
+    assert parse_point_detail("Main Menu").value is None
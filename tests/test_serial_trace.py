@@ -0,0 +1,49 @@
+import time
+
+from app.terminal.driver import TerminalDriver
+from app.terminal.timing import TimingProfile
+from app.terminal.trace import DIRECTION_READ, DIRECTION_WRITE, ReplaySerial, TraceRecorder, read_trace
+from tests.fake_serial import FakeSerial
+
+
+def test_trace_round_trip(tmp_path):
+    path = str(tmp_path / "session.trace")
+    recorder = TraceRecorder(FakeSerial([b"Main Menu"]), path)
+    recorder.write(b"\x1b")
+    assert recorder.read() == b"Main Menu"
+    assert recorder.read() == b""
+    recorder.close()
+    events = read_trace(path)
+    assert [(e.direction, e.data) for e in events] == [
+        (DIRECTION_WRITE, b"\x1b"),
+        (DIRECTION_READ, b"Main Menu"),
+    ]
+    assert events[1].offset >= events[0].offset
+
+
+def test_replay_drives_terminal_driver(tmp_path):
+    path = str(tmp_path / "session.trace")
+    recorder = TraceRecorder(FakeSerial([b"\x1b[2JPoint  Name            Value\r\n", b"  1    Temp Supply      72.4\r\n"]), path)
+    recorder.write(b"2")
+    recorder.read()
+    recorder.read()
+    recorder.close()
+
+    replay = ReplaySerial(path, speed=10.0, timeout=0.05, strict=True)
+    driver = TerminalDriver(timing=TimingProfile(adaptive=False), transport=replay)
+    driver.send("2")
+    start = time.monotonic()
+    screen = driver._read_for(1.0)
+    assert "Temp Supply      72.4" in screen
+    assert time.monotonic() - start < 1.0
+    assert replay.written == [b"2"]
+
+
+def test_trace_recorder_flushes_each_record(tmp_path):
+    path = str(tmp_path / "live.trace")
+    recorder = TraceRecorder(FakeSerial([b"Main Menu"]), path)
+    recorder.write(b"\x1b")
+    recorder.read()
+    events = read_trace(path)
+    assert [event.direction for event in events] == [DIRECTION_WRITE, DIRECTION_READ]
+    recorder.close()
@@ -0,0 +1,41 @@
+import pytest
+
+from app.jobs.worker import _handle_read_point
+from app.models import Job, JOB_READ_POINT
+from app.terminal.driver import TerminalDriver
+from app.terminal.simulator import PanelSimulator, SimulatorTransport
+from app.terminal.timing import TimingProfile
+
+
+def _driver(simulator):
+    return TerminalDriver(timing=TimingProfile(adaptive=False), transport=SimulatorTransport(simulator))
+
+
+def test_driver_reads_simulated_group_and_point():
+    simulator = PanelSimulator({2: {1: ["Temp Supply", "72.4"], 2: ["Fan Status", "ON"]}})
+    driver = _driver(simulator)
+
+    result = driver.read_group_values(2)
+    points = {p.point_number: p.value for p in result["points"] if p.point_number is not None}
+    assert points == {1: "72.4", 2: "ON"}
+
+    detail = driver.read_point_value(2, 2)
+    assert detail["value"] == "ON"
+    assert detail["status"] == "Normal"
+
+
+def test_driver_commands_simulated_point():
+    simulator = PanelSimulator({2: {1: ["Temp Supply", "72.4"]}})
+    driver = _driver(simulator)
+    result = driver.command_point(2, 1, "SET", "70.0")
+    assert "accepted" in result["raw_screen"]
+    assert simulator.points[2][1][1] == "70.0"
+
+
+def test_read_point_job_fails_when_value_missing():
+    simulator = PanelSimulator({2: {1: ["Temp Supply", "72.4"]}})
+    job = Job(type=JOB_READ_POINT, payload_json={"group_number": 2, "point_number": 9, "point_id": 1})
+    with pytest.raises(ValueError) as excinfo:
+        _handle_read_point(None, _driver(simulator), job)
+    assert "raw_screen" in str(excinfo.value)
+    assert "Temp Supply" in str(excinfo.value)
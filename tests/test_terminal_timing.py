@@ -0,0 +1,119 @@
+import time
+
+import pytest
+
+from app.terminal.driver import POLL_INTERVAL, TerminalDriver
+from app.terminal.timing import SCREEN_GROUP_SUMMARY, TimingProfile
+from tests.fake_serial import FakeSerial
+
+
+def test_timing_profile_learns_shorter_waits():
+    profile = TimingProfile(min_samples=3)
+    assert profile.quiet_gap(SCREEN_GROUP_SUMMARY) == 0.3
+    for _ in range(3):
+        profile.record(SCREEN_GROUP_SUMMARY, first_byte=0.05, complete=0.4, max_gap=0.06)
+    assert profile.quiet_gap(SCREEN_GROUP_SUMMARY) < 0.3
+    assert profile.first_byte_wait(SCREEN_GROUP_SUMMARY, 2.0) < 0.3
+    assert profile.read_window(SCREEN_GROUP_SUMMARY, 2.0) < 2.0
+    profile.adaptive = False
+    assert profile.quiet_gap(SCREEN_GROUP_SUMMARY) == 0.3
+
+
+def test_timing_profile_persists(tmp_path):
+    path = str(tmp_path / "timing.json")
+    profile = TimingProfile(path=path, min_samples=1)
+    profile.record(SCREEN_GROUP_SUMMARY, 0.05, 0.4, 0.06)
+    profile.save()
+    restored = TimingProfile(path=path, min_samples=1)
+    restored.load()
+    assert restored.quiet_gap(SCREEN_GROUP_SUMMARY) == profile.quiet_gap(SCREEN_GROUP_SUMMARY)
+
+
+def test_read_for_records_sample():
+    profile = TimingProfile()
+    driver = TerminalDriver(timing=profile)
+    driver.serial = FakeSerial([b"Point  Name  Value\r\n", b"  1    Temp   72.4"])
+    screen = driver._read_for(1.0, SCREEN_GROUP_SUMMARY)
+    assert "Temp" in screen
+    assert len(profile.screens[SCREEN_GROUP_SUMMARY]) == 1
+
+
+def test_misses_pull_learned_waits_back_up():
+    profile = TimingProfile(min_samples=3, window=10)
+    for _ in range(9):
+        profile.record(SCREEN_GROUP_SUMMARY, first_byte=0.05, complete=0.4, max_gap=0.06)
+    assert profile.quiet_gap(SCREEN_GROUP_SUMMARY) < 0.3
+    profile.record_miss(SCREEN_GROUP_SUMMARY, 2.0)
+    assert profile.quiet_gap(SCREEN_GROUP_SUMMARY) == 0.3
+    assert profile.read_window(SCREEN_GROUP_SUMMARY, 2.0) == 2.0
+
+
+def test_read_without_response_is_recorded_as_miss():
+    profile = TimingProfile(min_samples=1)
+    driver = TerminalDriver(timing=profile)
+    driver.serial = FakeSerial([])
+    driver._read_for(1.0, SCREEN_GROUP_SUMMARY)
+    assert list(profile.screens[SCREEN_GROUP_SUMMARY].first_byte) == [1.0]
+    assert list(profile.screens[SCREEN_GROUP_SUMMARY].max_gap) == [0.3]
+
+
+def test_read_polls_with_short_timeout_and_restores_it():
+    class SlowSerial(FakeSerial):
+        timeout = 1.0
+        timeouts = []
+
+        def read(self, size=1024):
+            self.timeouts.append(self.timeout)
+            return super().read(size)
+
+    driver = TerminalDriver(timing=TimingProfile(adaptive=False))
+    driver.serial = SlowSerial([b"Main Menu"])
+    driver._read_for(1.0)
+    assert set(driver.serial.timeouts) == {POLL_INTERVAL}
+    assert driver.serial.timeout == 1.0
+
+
+class DelayedSerial(FakeSerial):
+    """Answers each write with `response` only after `delay` seconds, honouring `timeout`."""
+
+    def __init__(self, response, delay):
+        super().__init__()
+        self.response = response
+        self.delay = delay
+        self.timeout = 1.0
+        self.due = None
+
+    def write(self, data):
+        super().write(data)
+        self.due = time.monotonic() + self.delay
+
+    def read(self, size=1024):
+        if self.due is None:
+            time.sleep(self.timeout)
+            return b""
+        remaining = self.due - time.monotonic()
+        if remaining > self.timeout:
+            time.sleep(self.timeout)
+            return b""
+        time.sleep(max(0.0, remaining))
+        self.due = None
+        return self.response
+
+
+@pytest.mark.parametrize("delay", [0.5, 0.9])
+def test_read_waits_for_slow_first_byte(delay):
+    profile = TimingProfile()
+    driver = TerminalDriver(timing=profile)
+    driver.serial = DelayedSerial(b"Main Menu", delay)
+    driver.send("\x1b")
+    assert "Main Menu" in driver._read_for(1.0, SCREEN_GROUP_SUMMARY)
+    assert list(profile.screens[SCREEN_GROUP_SUMMARY].first_byte)[0] >= delay
+
+
+def test_missed_first_byte_lifts_learned_wait_to_window():
+    profile = TimingProfile(min_samples=3, window=10)
+    for _ in range(9):
+        profile.record(SCREEN_GROUP_SUMMARY, first_byte=0.05, complete=0.4, max_gap=0.06)
+    assert profile.first_byte_wait(SCREEN_GROUP_SUMMARY, 2.0) < 0.3
+    profile.record_miss(SCREEN_GROUP_SUMMARY, 2.0)
+    assert profile.first_byte_wait(SCREEN_GROUP_SUMMARY, 2.0) == 2.0
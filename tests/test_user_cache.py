@@ -0,0 +1,24 @@
+import time
+
+from app.auth.user_cache import SessionUser, UserCache
+
+
+def test_user_cache_hits_evicts_and_invalidates():
+    cache = UserCache(ttl=60, maxsize=2)
+    assert cache.get(1) is None
+    cache.put(SessionUser(1, "a@example.com", "ADMIN"))
+    cache.put(SessionUser(2, "b@example.com", "USER"))
+    assert cache.get(1).role == "ADMIN"
+    cache.put(SessionUser(3, "c@example.com", "USER"))
+    assert cache.get(2) is None
+    cache.invalidate(1)
+    assert cache.get(1) is None
+    assert cache.get(3).email == "c@example.com"
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+def test_user_cache_expires():
+    cache = UserCache(ttl=0.01, maxsize=10)
+    cache.put(SessionUser(1, "a@example.com", "ADMIN"))
+    time.sleep(0.02)
+    assert cache.get(1) is None